@@ -0,0 +1,42 @@
+"""Blocking waits on an ECU's active fault list"""
+
+import threading
+from typing import Callable
+
+
+class FaultSignal:
+    """
+    Lets threads block until an ECU's active faults satisfy a predicate.
+
+    The ECU calls notify() whenever its fault list may have changed; waiters
+    re-check their predicate then instead of polling on a fixed interval.
+    """
+
+    def __init__(self, get_faults: Callable[[], list]):
+        self._get_faults = get_faults
+        self._condition = threading.Condition()
+        self._waiters = 0
+
+    def notify(self):
+        """Wake any waiters after a state change (cheap when nobody waits)"""
+        if self._waiters:
+            with self._condition:
+                self._condition.notify_all()
+
+    def wait_for(self, predicate: Callable[[list], bool], timeout: float) -> bool:
+        """
+        Wait until predicate(active faults) is true
+        Args:
+            predicate: Called with the current fault list
+            timeout: Maximum time to wait in seconds
+        Returns:
+            True if the predicate held before the timeout
+        """
+        with self._condition:
+            self._waiters += 1
+            try:
+                return self._condition.wait_for(
+                    lambda: predicate(self._get_faults()), max(0.0, timeout)
+                )
+            finally:
+                self._waiters -= 1
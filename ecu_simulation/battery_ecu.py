@@ -1,15 +1,26 @@
 """Battery ECU Simulation Module"""
 
 import asyncio
+import functools
 import logging
+import os
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
+
+import numpy as np
 import yaml
 
+from ._fault_signal import FaultSignal
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class BatteryCell:
     """Represents a single battery cell"""
 
@@ -19,7 +30,7 @@ class BatteryCell:
     capacity: float = 3.2  # Ah
 
 
-@dataclass
+@dataclass(slots=True)
 class BatteryPackState:
     """Current state of the battery pack"""
 
@@ -34,6 +45,21 @@ class BatteryPackState:
     min_cell_voltage: float = 3.7
 
 
+# Values reported for cell IDs outside the pack
+_UNKNOWN_CELL = BatteryCell(id=-1)
+
+# Row indices into the shared cell data block
+_VOLTAGE = 0
+_TEMPERATURE = 1
+
+
+@functools.lru_cache(maxsize=32)
+def _read_config_file(path: str, mtime_ns: int) -> dict:
+    """Parse a YAML config file, cached per path and modification time"""
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 class BatteryECU:
     """
     Simulates a Battery Management System (BMS) ECU.
@@ -44,14 +70,44 @@ class BatteryECU:
     - Cell balancing control
     - Thermal management
     - Fault detection and reporting
+
+    Cell data is stored as parallel NumPy arrays (structure of arrays) indexed
+    by cell ID, so pack-level reductions run as vectorized array operations.
     """
 
     def __init__(self, config_path: Optional[str] = None):
         """Initialize Battery ECU with optional configuration file"""
-        self.cells: Dict[int, BatteryCell] = {}
         self.state = BatteryPackState()
         self.running = False
+        # Bumped on every pack state update; lets callers cache derived views
+        self.state_version = 0
+        self._faults_cache: Optional[list] = None
+        self._dict_cache: Optional[dict] = None
+        self._fault_signal = FaultSignal(self.check_faults)
         self.config = self._load_config(config_path)
+
+        # Configuration-derived constants used on hot paths
+        num_cells = self.config["num_cells"]
+        self.num_cells: int = num_cells
+        self._vmax = self.config["max_voltage"]
+        self._vmin = self.config["min_voltage"]
+        self._tmax = self.config["max_temperature"]
+        self._tmin = self.config["min_temperature"]
+        self._total_capacity = num_cells * self.config["cell_capacity"]  # Ah
+        self._soc_per_ah = 100.0 / self._total_capacity if self._total_capacity else 0.0
+
+        # Voltages and temperatures share one 2xN block so pack statistics
+        # can be reduced for both rows in a single pass
+        self._cell_data = np.empty((2, num_cells), dtype=np.float64)
+        self.voltages = self._cell_data[_VOLTAGE]  # Volts
+        self.temperatures = self._cell_data[_TEMPERATURE]  # Celsius
+        self.capacities = np.empty(num_cells, dtype=np.float64)  # Ah
+        self._balance_delta = np.empty(num_cells, dtype=np.float64)  # Scratch buffer
+
+        # Per-row sum/max/min, kept current for single-cell writes
+        self._sums = [0.0, 0.0]
+        self._maxs = [0.0, 0.0]
+        self._mins = [0.0, 0.0]
         self._initialize_cells()
 
     def _load_config(self, config_path: Optional[str]) -> dict:
@@ -68,8 +124,8 @@ class BatteryECU:
 
         if config_path:
             try:
-                with open(config_path, "r") as f:
-                    return yaml.safe_load(f)
+                mtime_ns = os.stat(config_path).st_mtime_ns
+                return dict(_read_config_file(config_path, mtime_ns))
             except FileNotFoundError:
                 logger.warning(f"Config file not found: {config_path}")
 
@@ -77,38 +133,99 @@ class BatteryECU:
 
     def _initialize_cells(self):
         """Initialize battery cells with default values"""
-        for i in range(self.config["num_cells"]):
-            self.cells[i] = BatteryCell(
-                id=i,
-                voltage=self.config["nominal_voltage"] + (i % 10) * 0.01,
-                temperature=25.0 + (i % 5),
-                capacity=self.config["cell_capacity"],
-            )
+        index = np.arange(self.num_cells)
+        self.voltages[:] = self.config["nominal_voltage"] + (index % 10) * 0.01
+        self.temperatures[:] = 25.0 + (index % 5)
+        self.capacities[:] = self.config["cell_capacity"]
         self._update_pack_state()
 
     def _update_pack_state(self):
         """Update pack-level state from individual cells"""
-        if not self.cells:
+        if self.num_cells == 0:
             return
 
-        voltages = [cell.voltage for cell in self.cells.values()]
-        temperatures = [cell.temperature for cell in self.cells.values()]
+        cell_data = self._cell_data
+        self._sums = cell_data.sum(axis=1).tolist()
+        self._maxs = cell_data.max(axis=1).tolist()
+        self._mins = cell_data.min(axis=1).tolist()
+        self._publish_pack_state()
+
+    def _update_cell(self, row: int, cell_id: int, value: float):
+        """
+        Write one cell value and update pack aggregates incrementally
+
+        Sums are adjusted by the delta; an extremum is only rescanned when
+        the cell that held it moves inwards.
+        """
+        values = self._cell_data[row]
+        old = float(values[cell_id])
+        values[cell_id] = value
+        value = float(values[cell_id])
+
+        self._sums[row] += value - old
+        if value >= self._maxs[row]:
+            self._maxs[row] = value
+        elif old == self._maxs[row]:
+            self._maxs[row] = float(values.max())
+        if value <= self._mins[row]:
+            self._mins[row] = value
+        elif old == self._mins[row]:
+            self._mins[row] = float(values.min())
+        self._publish_pack_state()
+
+    def _update_cells(self, row: int, values: Dict[int, float]):
+        """Write several cell values with one array store and one aggregate pass"""
+        cell_ids = [cell_id for cell_id in values if self.has_cell(cell_id)]
+        if not cell_ids:
+            return
+        self._cell_data[row, cell_ids] = [values[cell_id] for cell_id in cell_ids]
+        self._update_pack_state()
 
-        self.state.voltage = sum(voltages)
+    def _publish_pack_state(self):
+        """Copy cached aggregates into the pack state"""
+        voltage_sum, temperature_sum = self._sums
+        self.state.voltage = voltage_sum
         self.state.current = 0.0  # Would be calculated from power flow
-        self.state.temperature = sum(temperatures) / len(temperatures)
-        self.state.max_cell_temp = max(temperatures)
-        self.state.min_cell_temp = min(temperatures)
-        self.state.max_cell_voltage = max(voltages)
-        self.state.min_cell_voltage = min(voltages)
+        self.state.temperature = temperature_sum / self.num_cells
+        self.state.max_cell_temp = self._maxs[_TEMPERATURE]
+        self.state.min_cell_temp = self._mins[_TEMPERATURE]
+        self.state.max_cell_voltage = self._maxs[_VOLTAGE]
+        self.state.min_cell_voltage = self._mins[_VOLTAGE]
+        self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        """Drop cached faults and state dictionary after a state change"""
+        self.state_version += 1
+        self._faults_cache = None
+        self._dict_cache = None
+        self._fault_signal.notify()
+
+    def has_cell(self, cell_id: int) -> bool:
+        """Check whether a cell ID is within the pack"""
+        return 0 <= cell_id < self.num_cells
+
+    def get_cell(self, cell_id: int) -> BatteryCell:
+        """Get a snapshot of a specific cell"""
+        if not self.has_cell(cell_id):
+            return BatteryCell(id=cell_id)
+        return BatteryCell(
+            id=cell_id,
+            voltage=float(self.voltages[cell_id]),
+            temperature=float(self.temperatures[cell_id]),
+            capacity=float(self.capacities[cell_id]),
+        )
 
     def get_cell_voltage(self, cell_id: int) -> float:
         """Get voltage of specific cell"""
-        return self.cells.get(cell_id, BatteryCell(id=cell_id)).voltage
+        if not self.has_cell(cell_id):
+            return _UNKNOWN_CELL.voltage
+        return float(self.voltages[cell_id])
 
     def get_cell_temperature(self, cell_id: int) -> float:
         """Get temperature of specific cell"""
-        return self.cells.get(cell_id, BatteryCell(id=cell_id)).temperature
+        if not self.has_cell(cell_id):
+            return _UNKNOWN_CELL.temperature
+        return float(self.temperatures[cell_id])
 
     def get_soc(self) -> float:
         """Get current State of Charge"""
@@ -132,15 +249,21 @@ class BatteryECU:
 
     def set_cell_voltage(self, cell_id: int, voltage: float):
         """Set voltage of specific cell (for testing/fault injection)"""
-        if cell_id in self.cells:
-            self.cells[cell_id].voltage = voltage
-            self._update_pack_state()
+        if self.has_cell(cell_id):
+            self._update_cell(_VOLTAGE, cell_id, voltage)
 
     def set_cell_temperature(self, cell_id: int, temperature: float):
         """Set temperature of specific cell (for testing/fault injection)"""
-        if cell_id in self.cells:
-            self.cells[cell_id].temperature = temperature
-            self._update_pack_state()
+        if self.has_cell(cell_id):
+            self._update_cell(_TEMPERATURE, cell_id, temperature)
+
+    def set_cell_voltages(self, voltages: Dict[int, float]):
+        """Set voltages of several cells at once (unknown cell IDs are ignored)"""
+        self._update_cells(_VOLTAGE, voltages)
+
+    def set_cell_temperatures(self, temperatures: Dict[int, float]):
+        """Set temperatures of several cells at once (unknown cell IDs are ignored)"""
+        self._update_cells(_TEMPERATURE, temperatures)
 
     def simulate_charge(self, current: float, duration: float):
         """
@@ -154,50 +277,61 @@ class BatteryECU:
         capacity_change = energy / 3600  # Convert to Ah
 
         # Update SOC based on capacity
-        total_capacity = self.config["num_cells"] * self.config["cell_capacity"]
-        soc_change = (capacity_change / total_capacity) * 100
-        self.state.soc = max(0, min(100, self.state.soc + soc_change))
+        soc_change = capacity_change * self._soc_per_ah
+        self.state.soc = max(0.0, min(100.0, self.state.soc + soc_change))
 
         # Simulate voltage changes due to charge/discharge
         voltage_factor = 1 + (current * 0.001)
-        for cell in self.cells.values():
-            cell.voltage *= voltage_factor
-            cell.voltage = max(
-                self.config["min_voltage"], min(self.config["max_voltage"], cell.voltage)
-            )
+        self.voltages *= voltage_factor
+        np.clip(self.voltages, self._vmin, self._vmax, out=self.voltages)
 
         self._update_pack_state()
 
     def balance_cells(self):
         """Simulate cell balancing - equalize cell voltages"""
-        if not self.cells:
+        if self.num_cells == 0:
             return
 
-        avg_voltage = sum(c.voltage for c in self.cells.values()) / len(self.cells)
-        for cell in self.cells.values():
-            # Move cell voltage towards average
-            cell.voltage += (avg_voltage - cell.voltage) * 0.1
+        # Move each cell voltage 10% of the way towards the average
+        avg_voltage = self.voltages.mean()
+        np.subtract(avg_voltage, self.voltages, out=self._balance_delta)
+        self._balance_delta *= 0.1
+        self.voltages += self._balance_delta
 
         self._update_pack_state()
 
     def check_faults(self) -> list:
         """Check for battery system faults"""
+        if self._faults_cache is None:
+            self._faults_cache = self._detect_faults()
+        return list(self._faults_cache)
+
+    def wait_for_faults(self, predicate: Callable[[list], bool], timeout: float) -> bool:
+        """
+        Block until predicate(check_faults()) is true, for up to timeout seconds
+        Returns:
+            True if the predicate held before the timeout
+        """
+        return self._fault_signal.wait_for(predicate, timeout)
+
+    def _detect_faults(self) -> list:
+        """Evaluate fault thresholds against the current pack state"""
         faults = []
 
         # Check for overvoltage
-        if self.state.max_cell_voltage > self.config["max_voltage"]:
+        if self.state.max_cell_voltage > self._vmax:
             faults.append("OVERVOLTAGE")
 
         # Check for undervoltage
-        if self.state.min_cell_voltage < self.config["min_voltage"]:
+        if self.state.min_cell_voltage < self._vmin:
             faults.append("UNDERVOLTAGE")
 
         # Check for overtemperature
-        if self.state.max_cell_temp > self.config["max_temperature"]:
+        if self.state.max_cell_temp > self._tmax:
             faults.append("OVERTEMPERATURE")
 
         # Check for undertemperature
-        if self.state.min_cell_temp < self.config["min_temperature"]:
+        if self.state.min_cell_temp < self._tmin:
             faults.append("UNDERTEMPERATURE")
 
         # Check for low SOC
@@ -230,6 +364,14 @@ class BatteryECU:
 
     def to_dict(self) -> dict:
         """Export current state as dictionary"""
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        state_dict = dict(self._dict_cache)
+        state_dict["faults"] = list(state_dict["faults"])
+        return state_dict
+
+    def _build_dict(self) -> dict:
+        """Build the state dictionary exported by to_dict()"""
         return {
             "soc": self.state.soc,
             "soh": self.state.soh,
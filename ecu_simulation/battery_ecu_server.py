@@ -7,17 +7,22 @@ enabling HTTP-based HIL testing with separate processes for more realistic testi
 import asyncio
 import logging
 from contextlib import asynccontextmanager
-from typing import Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Optional
 
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException, status
-from pydantic import BaseModel, Field, field_validator
+from fastapi import FastAPI, HTTPException, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 
 from ecu_simulation.battery_ecu import BatteryECU
 
 logger = logging.getLogger(__name__)
 
-# Global ECU instance
+# Global ECU instance. Endpoints stay ``async def`` so every access to it
+# runs on the event loop thread: the ECU calls are short, cached reads or
+# vectorized updates, and a threadpool hop would cost more than the work
+# while letting readers observe a half-applied update.
 ecu_instance: Optional[BatteryECU] = None
 
 
@@ -29,44 +34,38 @@ ecu_instance: Optional[BatteryECU] = None
 class ChargeRequest(BaseModel):
     """Request model for charging simulation"""
 
-    current: float = Field(..., description="Charging current in Amps (positive = charging)")
+    current: float = Field(
+        ..., description="Charging current in Amps (positive = charging)", ge=-500, le=500
+    )
     duration: float = Field(..., description="Duration in seconds", ge=0)
 
-    @field_validator("current")
-    @classmethod
-    def validate_current(cls, v: float) -> float:
-        """Validate current is within reasonable bounds"""
-        if not -500 <= v <= 500:
-            raise ValueError("Current must be between -500 and 500 Amps")
-        return v
-
 
 class CellVoltageRequest(BaseModel):
     """Request model for setting cell voltage (fault injection)"""
 
-    voltage: float = Field(..., description="Cell voltage in Volts")
-
-    @field_validator("voltage")
-    @classmethod
-    def validate_voltage(cls, v: float) -> float:
-        """Validate voltage is within physical limits"""
-        if not 0 <= v <= 10:
-            raise ValueError("Voltage must be between 0 and 10 Volts")
-        return v
+    voltage: float = Field(..., description="Cell voltage in Volts", ge=0, le=10)
 
 
 class CellTemperatureRequest(BaseModel):
     """Request model for setting cell temperature (fault injection)"""
 
-    temperature: float = Field(..., description="Cell temperature in Celsius")
+    temperature: float = Field(..., description="Cell temperature in Celsius", ge=-50, le=150)
 
-    @field_validator("temperature")
-    @classmethod
-    def validate_temperature(cls, v: float) -> float:
-        """Validate temperature is within physical limits"""
-        if not -50 <= v <= 150:
-            raise ValueError("Temperature must be between -50 and 150 Celsius")
-        return v
+
+class CellVoltagesRequest(BaseModel):
+    """Request model for setting several cell voltages at once"""
+
+    voltages: Dict[int, Annotated[float, Field(ge=0, le=10)]] = Field(
+        ..., description="Cell voltages in Volts, by cell ID"
+    )
+
+
+class CellTemperaturesRequest(BaseModel):
+    """Request model for setting several cell temperatures at once"""
+
+    temperatures: Dict[int, Annotated[float, Field(ge=-50, le=150)]] = Field(
+        ..., description="Cell temperatures in Celsius, by cell ID"
+    )
 
 
 class ECUStatusResponse(BaseModel):
@@ -105,6 +104,12 @@ class CellTemperatureResponse(BaseModel):
     temperature: float
 
 
+class CellVoltagesResponse(BaseModel):
+    """Response model for all-cell voltage queries"""
+
+    voltages: List[float] = Field(..., description="Cell voltages in Volts, by cell ID")
+
+
 class FaultsResponse(BaseModel):
     """Response model for faults query"""
 
@@ -126,6 +131,26 @@ class SuccessResponse(BaseModel):
     details: Optional[Dict] = None
 
 
+# =============================================================================
+# Response Classes
+# =============================================================================
+
+
+# NumPy scalars read straight from the ECU cell arrays serialize natively
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson
+
+    Hot GET endpoints return plain dicts through this class instead of building
+    Pydantic models; the models above still document the schema in OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
 # =============================================================================
 # Lifespan Management
 # =============================================================================
@@ -134,11 +159,12 @@ class SuccessResponse(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan - initialize and cleanup ECU"""
-    global ecu_instance
+    global ecu_instance, _status_cache
 
     # Startup
     logger.info("Starting Battery ECU API server")
     ecu_instance = BatteryECU()
+    _status_cache = None
     await ecu_instance.start()
     logger.info("Battery ECU initialized successfully")
 
@@ -163,8 +189,12 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
+# Rendered /ecu/status body, keyed on (ECU state version, running flag)
+_status_cache: Optional[tuple[tuple[int, bool], bytes]] = None
+
 
 # =============================================================================
 # Helper Functions
@@ -180,14 +210,27 @@ def get_ecu() -> BatteryECU:
     return ecu_instance
 
 
-def validate_cell_id(cell_id: int) -> None:
-    """Validate cell ID exists"""
+def validate_cell_id(cell_id: int) -> BatteryECU:
+    """Validate cell ID exists and return the ECU it belongs to"""
     ecu = get_ecu()
-    if cell_id not in ecu.cells:
+    if not ecu.has_cell(cell_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Cell {cell_id} not found. Valid range: 0-{len(ecu.cells) - 1}",
+            detail=f"Cell {cell_id} not found. Valid range: 0-{ecu.num_cells - 1}",
         )
+    return ecu
+
+
+def validate_cell_ids(cell_ids) -> BatteryECU:
+    """Validate every cell ID exists and return the ECU they belong to"""
+    ecu = get_ecu()
+    for cell_id in cell_ids:
+        if not ecu.has_cell(cell_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Cell {cell_id} not found. Valid range: 0-{ecu.num_cells - 1}",
+            )
+    return ecu
 
 
 # =============================================================================
@@ -221,17 +264,26 @@ async def stop_ecu() -> SuccessResponse:
     return SuccessResponse(message="ECU stopped successfully")
 
 
-@app.get("/ecu/status", response_model=ECUStatusResponse, tags=["ECU Control"])
-async def get_ecu_status() -> ECUStatusResponse:
+@app.get(
+    "/ecu/status",
+    response_model=None,
+    responses={200: {"model": ECUStatusResponse}},
+    tags=["ECU Control"],
+)
+async def get_ecu_status() -> Response:
     """
     Get full ECU state
 
     Returns complete status of the battery ECU including all state variables.
     """
+    global _status_cache
     ecu = get_ecu()
-    status_dict = ecu.to_dict()
-    status_dict["running"] = ecu.running
-    return ECUStatusResponse(**status_dict)
+    key = (ecu.state_version, ecu.running)
+    if _status_cache is None or _status_cache[0] != key:
+        status_dict = ecu.to_dict()
+        status_dict["running"] = ecu.running
+        _status_cache = (key, orjson.dumps(status_dict, option=_ORJSON_OPTIONS))
+    return Response(content=_status_cache[1], media_type="application/json")
 
 
 # =============================================================================
@@ -239,39 +291,64 @@ async def get_ecu_status() -> ECUStatusResponse:
 # =============================================================================
 
 
-@app.get("/ecu/state/soc", response_model=StateResponse, tags=["State"])
-async def get_soc() -> StateResponse:
+@app.get(
+    "/ecu/state/soc",
+    response_model=None,
+    responses={200: {"model": StateResponse}},
+    tags=["State"],
+)
+async def get_soc() -> dict:
     """Get State of Charge (SOC) percentage"""
     ecu = get_ecu()
-    return StateResponse(value=ecu.get_soc())
+    return {"value": ecu.get_soc()}
 
 
-@app.get("/ecu/state/voltage", response_model=StateResponse, tags=["State"])
-async def get_voltage() -> StateResponse:
+@app.get(
+    "/ecu/state/voltage",
+    response_model=None,
+    responses={200: {"model": StateResponse}},
+    tags=["State"],
+)
+async def get_voltage() -> dict:
     """Get pack voltage in Volts"""
     ecu = get_ecu()
-    return StateResponse(value=ecu.get_pack_voltage())
+    return {"value": ecu.get_pack_voltage()}
 
 
-@app.get("/ecu/state/current", response_model=StateResponse, tags=["State"])
-async def get_current() -> StateResponse:
+@app.get(
+    "/ecu/state/current",
+    response_model=None,
+    responses={200: {"model": StateResponse}},
+    tags=["State"],
+)
+async def get_current() -> dict:
     """Get pack current in Amps"""
     ecu = get_ecu()
-    return StateResponse(value=ecu.get_pack_current())
+    return {"value": ecu.get_pack_current()}
 
 
-@app.get("/ecu/state/temperature", response_model=StateResponse, tags=["State"])
-async def get_temperature() -> StateResponse:
+@app.get(
+    "/ecu/state/temperature",
+    response_model=None,
+    responses={200: {"model": StateResponse}},
+    tags=["State"],
+)
+async def get_temperature() -> dict:
     """Get average pack temperature in Celsius"""
     ecu = get_ecu()
-    return StateResponse(value=ecu.get_pack_temperature())
+    return {"value": ecu.get_pack_temperature()}
 
 
-@app.get("/ecu/state/soh", response_model=StateResponse, tags=["State"])
-async def get_soh() -> StateResponse:
+@app.get(
+    "/ecu/state/soh",
+    response_model=None,
+    responses={200: {"model": StateResponse}},
+    tags=["State"],
+)
+async def get_soh() -> dict:
     """Get State of Health (SOH) percentage"""
     ecu = get_ecu()
-    return StateResponse(value=ecu.get_soh())
+    return {"value": ecu.get_soh()}
 
 
 # =============================================================================
@@ -280,18 +357,21 @@ async def get_soh() -> StateResponse:
 
 
 @app.get(
-    "/ecu/cell/{cell_id}/voltage", response_model=CellVoltageResponse, tags=["Cell Management"]
+    "/ecu/cell/{cell_id}/voltage",
+    response_model=None,
+    responses={200: {"model": CellVoltageResponse}},
+    tags=["Cell Management"],
 )
-async def get_cell_voltage(cell_id: int) -> CellVoltageResponse:
+async def get_cell_voltage(cell_id: int) -> dict:
     """
     Get voltage of a specific cell
 
     - **cell_id**: Cell identifier (0-based index)
     """
-    validate_cell_id(cell_id)
-    ecu = get_ecu()
-    voltage = ecu.get_cell_voltage(cell_id)
-    return CellVoltageResponse(cell_id=cell_id, voltage=voltage)
+    ecu = validate_cell_id(cell_id)
+    # Cell ID is already range-checked, so index the array directly
+    voltage = ecu.voltages[cell_id]
+    return {"cell_id": cell_id, "voltage": voltage}
 
 
 @app.put("/ecu/cell/{cell_id}/voltage", response_model=SuccessResponse, tags=["Cell Management"])
@@ -302,10 +382,9 @@ async def set_cell_voltage(cell_id: int, request: CellVoltageRequest) -> Success
     - **cell_id**: Cell identifier (0-based index)
     - **voltage**: New voltage value in Volts
     """
-    validate_cell_id(cell_id)
-    ecu = get_ecu()
+    ecu = validate_cell_id(cell_id)
     ecu.set_cell_voltage(cell_id, request.voltage)
-    logger.info(f"Set cell {cell_id} voltage to {request.voltage}V")
+    logger.info("Set cell %s voltage to %sV", cell_id, request.voltage)
     return SuccessResponse(
         message=f"Cell {cell_id} voltage set",
         details={"cell_id": cell_id, "voltage": request.voltage},
@@ -314,19 +393,19 @@ async def set_cell_voltage(cell_id: int, request: CellVoltageRequest) -> Success
 
 @app.get(
     "/ecu/cell/{cell_id}/temperature",
-    response_model=CellTemperatureResponse,
+    response_model=None,
+    responses={200: {"model": CellTemperatureResponse}},
     tags=["Cell Management"],
 )
-async def get_cell_temperature(cell_id: int) -> CellTemperatureResponse:
+async def get_cell_temperature(cell_id: int) -> dict:
     """
     Get temperature of a specific cell
 
     - **cell_id**: Cell identifier (0-based index)
     """
-    validate_cell_id(cell_id)
-    ecu = get_ecu()
-    temperature = ecu.get_cell_temperature(cell_id)
-    return CellTemperatureResponse(cell_id=cell_id, temperature=temperature)
+    ecu = validate_cell_id(cell_id)
+    temperature = ecu.temperatures[cell_id]
+    return {"cell_id": cell_id, "temperature": temperature}
 
 
 @app.put(
@@ -339,16 +418,58 @@ async def set_cell_temperature(cell_id: int, request: CellTemperatureRequest) ->
     - **cell_id**: Cell identifier (0-based index)
     - **temperature**: New temperature value in Celsius
     """
-    validate_cell_id(cell_id)
-    ecu = get_ecu()
+    ecu = validate_cell_id(cell_id)
     ecu.set_cell_temperature(cell_id, request.temperature)
-    logger.info(f"Set cell {cell_id} temperature to {request.temperature}C")
+    logger.info("Set cell %s temperature to %sC", cell_id, request.temperature)
     return SuccessResponse(
         message=f"Cell {cell_id} temperature set",
         details={"cell_id": cell_id, "temperature": request.temperature},
     )
 
 
+@app.get(
+    "/ecu/cells/voltage",
+    response_model=None,
+    responses={200: {"model": CellVoltagesResponse}},
+    tags=["Cell Management"],
+)
+async def get_cell_voltages() -> dict:
+    """Get the voltages of all cells, indexed by cell ID"""
+    return {"voltages": get_ecu().voltages.tolist()}
+
+
+@app.put("/ecu/cells/voltage", response_model=SuccessResponse, tags=["Cell Management"])
+async def set_cell_voltages(request: CellVoltagesRequest) -> SuccessResponse:
+    """
+    Set voltages of several cells in one request (for fault injection)
+
+    - **voltages**: New voltage values in Volts, by cell ID
+    """
+    ecu = validate_cell_ids(request.voltages)
+    ecu.set_cell_voltages(request.voltages)
+    logger.info("Set %s cell voltages", len(request.voltages))
+    return SuccessResponse(
+        message=f"{len(request.voltages)} cell voltages set",
+        details={"voltages": request.voltages},
+    )
+
+
+@app.put("/ecu/cells/temperature", response_model=SuccessResponse, tags=["Cell Management"])
+async def set_cell_temperatures(request: CellTemperaturesRequest) -> SuccessResponse:
+    """
+    Set temperatures of several cells in one request (for fault injection)
+
+    - **temperatures**: New temperature values in Celsius, by cell ID
+    """
+    ecu = validate_cell_ids(request.temperatures)
+    ecu.set_cell_temperatures(request.temperatures)
+    logger.info("Set %s cell temperatures", len(request.temperatures))
+    return SuccessResponse(
+        message=f"{len(request.temperatures)} cell temperatures set",
+        details={"temperatures": request.temperatures},
+    )
+
+
 # =============================================================================
 # Simulation Control Endpoints
 # =============================================================================
@@ -369,7 +490,11 @@ async def simulate_charge(request: ChargeRequest) -> SuccessResponse:
     ecu.simulate_charge(request.current, request.duration)
     new_soc = ecu.get_soc()
     logger.info(
-        f"Charging: {request.current}A for {request.duration}s, SOC: {old_soc}% -> {new_soc}%"
+        "Charging: %sA for %ss, SOC: %s%% -> %s%%",
+        request.current,
+        request.duration,
+        old_soc,
+        new_soc,
     )
     return SuccessResponse(
         message="Charge simulation completed",
@@ -401,8 +526,13 @@ async def balance_cells() -> SuccessResponse:
 # =============================================================================
 
 
-@app.get("/ecu/faults", response_model=FaultsResponse, tags=["Faults"])
-async def get_faults() -> FaultsResponse:
+@app.get(
+    "/ecu/faults",
+    response_model=None,
+    responses={200: {"model": FaultsResponse}},
+    tags=["Faults"],
+)
+async def get_faults() -> dict:
     """
     Get active faults and Diagnostic Trouble Code (DTC)
 
@@ -411,7 +541,7 @@ async def get_faults() -> FaultsResponse:
     ecu = get_ecu()
     faults = ecu.check_faults()
     dtc = ecu.get_dtc()
-    return FaultsResponse(faults=faults, dtc=dtc)
+    return {"faults": faults, "dtc": dtc}
 
 
 @app.post("/ecu/dtc/clear", response_model=SuccessResponse, tags=["Faults"])
@@ -458,7 +588,18 @@ def main():
         host="0.0.0.0",
         port=8000,
         reload=False,
+        # The simulated pack lives in this process; extra workers would each
+        # own a divergent BatteryECU
+        workers=1,
         log_level="info",
+        # uvicorn[standard] ships uvloop and httptools; "auto" selects them
+        # where available and falls back to asyncio/h11 (e.g. uvloop on Windows)
+        loop="auto",
+        http="auto",
+        # Test harnesses reuse connections and fire requests in bursts
+        timeout_keep_alive=30,
+        backlog=2048,
+        access_log=False,
     )
 
 
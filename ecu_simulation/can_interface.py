@@ -3,14 +3,32 @@
 import asyncio
 import logging
 import struct
+from collections import deque
 from dataclasses import dataclass
 from typing import Callable, Dict, Optional
 import time
 
 logger = logging.getLogger(__name__)
 
+# Door status signal bits: byte 0 carries open flags, byte 1 lock flags
+_DOOR_OPEN_BITS = (("fl_open", 0x01), ("fr_open", 0x02), ("rl_open", 0x04), ("rr_open", 0x08))
+_DOOR_LOCKED_BITS = (
+    ("fl_locked", 0x01),
+    ("fr_locked", 0x02),
+    ("rl_locked", 0x04),
+    ("rr_locked", 0x08),
+)
+_DOOR_STATUS_STRUCT = struct.Struct("<BBBB")
 
-@dataclass
+# Callback registration ID that receives every message
+_WILDCARD_ID = 0xFFFFFFFF
+
+# BMS status layouts: parse decodes the first 8 bytes of a received frame
+_BMS_STATUS_BUILD_STRUCT = struct.Struct("<BBhhhBB")
+_BMS_STATUS_PARSE_STRUCT = struct.Struct("<BBHhBB")
+
+
+@dataclass(slots=True)
 class CANMessage:
     """Represents a CAN message"""
 
@@ -56,12 +74,39 @@ class CANInterface:
         self.bitrate = bitrate
         self.running = False
         self.message_callbacks: Dict[int, list[Callable]] = {}
-        self.message_log: list[CANMessage] = []
-        self.max_log_size = 10000
+        # Per-ID (callback, is_wildcard) fan-out, rebuilt when callbacks change
+        self._dispatch: Dict[int, tuple[tuple[Callable, bool], ...]] = {}
+        self._wildcard_dispatch: tuple[tuple[Callable, bool], ...] = ()
+        self.logging_enabled = True
+        # Ring buffer: the oldest message is dropped once the log is full
+        # (resize through max_log_size)
+        self.message_log: deque[CANMessage] = deque(maxlen=10000)
+        # Same messages bucketed by CAN ID, for filtered log queries
+        self._log_by_id: Dict[int, deque[CANMessage]] = {}
+        # (monotonic ns, frame bits) for the last second of traffic, plus their sum
+        self._bits_window: deque[tuple[int, int]] = deque()
+        self._bits_sum = 0
         self.tx_count = 0
         self.rx_count = 0
         self.bus_load = 0.0
 
+    @property
+    def max_log_size(self) -> int:
+        """Maximum number of messages kept in the message log"""
+        return self.message_log.maxlen
+
+    @max_log_size.setter
+    def max_log_size(self, size: int):
+        # A deque's maxlen is fixed, so rebuild the log (keeping the newest
+        # messages) and its per-ID buckets
+        self.message_log = deque(self.message_log, maxlen=size)
+        self._log_by_id = {}
+        for message in self.message_log:
+            bucket = self._log_by_id.get(message.id)
+            if bucket is None:
+                bucket = self._log_by_id[message.id] = deque()
+            bucket.append(message)
+
     def add_callback(self, can_id: int, callback: Callable[[CANMessage], None]):
         """
         Register a callback for specific CAN ID
@@ -72,35 +117,53 @@ class CANInterface:
         if can_id not in self.message_callbacks:
             self.message_callbacks[can_id] = []
         self.message_callbacks[can_id].append(callback)
+        self._rebuild_dispatch()
 
     def remove_callback(self, can_id: int, callback: Callable[[CANMessage], None]):
         """Remove a callback"""
         if can_id in self.message_callbacks and callback in self.message_callbacks[can_id]:
             self.message_callbacks[can_id].remove(callback)
+            self._rebuild_dispatch()
+
+    def _rebuild_dispatch(self):
+        """Snapshot callbacks so each message needs a single lookup"""
+        wildcard = tuple((cb, True) for cb in self.message_callbacks.get(_WILDCARD_ID, ()))
+        self._wildcard_dispatch = wildcard
+        self._dispatch = {
+            can_id: tuple((cb, False) for cb in callbacks) + wildcard
+            for can_id, callbacks in self.message_callbacks.items()
+        }
 
     def _notify_callbacks(self, message: CANMessage):
         """Notify registered callbacks of received message"""
-        # Check specific ID callbacks
-        if message.id in self.message_callbacks:
-            for callback in self.message_callbacks[message.id]:
-                try:
-                    callback(message)
-                except Exception as e:
-                    logger.error(f"Callback error for ID 0x{message.id:X}: {e}")
-
-        # Check wildcard callbacks
-        if 0xFFFFFFFF in self.message_callbacks:
-            for callback in self.message_callbacks[0xFFFFFFFF]:
-                try:
-                    callback(message)
-                except Exception as e:
-                    logger.error(f"Wildcard callback error: {e}")
+        # Specific ID callbacks first, then wildcard callbacks
+        for callback, is_wildcard in self._dispatch.get(message.id, self._wildcard_dispatch):
+            try:
+                callback(message)
+            except Exception as e:
+                if is_wildcard:
+                    logger.error("Wildcard callback error: %s", e)
+                else:
+                    logger.error("Callback error for ID 0x%X: %s", message.id, e)
 
     def _log_message(self, message: CANMessage):
         """Add message to log"""
-        self.message_log.append(message)
-        if len(self.message_log) > self.max_log_size:
-            self.message_log.pop(0)
+        log = self.message_log
+        if len(log) == log.maxlen:
+            if not log:
+                return  # max_log_size is 0: nothing is kept
+            # The oldest message is about to be evicted; drop it from its bucket too
+            evicted_id = log[0].id
+            bucket = self._log_by_id[evicted_id]
+            bucket.popleft()
+            if not bucket:
+                del self._log_by_id[evicted_id]
+        log.append(message)
+
+        bucket = self._log_by_id.get(message.id)
+        if bucket is None:
+            bucket = self._log_by_id[message.id] = deque()
+        bucket.append(message)
 
     async def send(self, can_id: int, data: bytes, extended: bool = False) -> bool:
         """
@@ -113,16 +176,26 @@ class CANInterface:
             True if sent successfully
         """
         if len(data) > 8:
-            logger.error(f"Data too long: {len(data)} bytes")
+            logger.error("Data too long: %d bytes", len(data))
             return False
 
+        dlc = len(data)
         message = CANMessage(
-            id=can_id, data=data, dlc=len(data), timestamp=time.time(), extended=extended
+            id=can_id, data=data, dlc=dlc, timestamp=time.time(), extended=extended
         )
 
         self.tx_count += 1
-        self._log_message(message)
-        logger.debug(f"TX: 0x{can_id:03X} - {data.hex()}")
+        if self.logging_enabled:
+            self._log_message(message)
+
+        # Feed the bus load window even when trace logging is off
+        bits = dlc * 8 + 47  # Including overhead
+        now = time.monotonic_ns()
+        self._bits_window.append((now, bits))
+        self._bits_sum += bits
+        self._update_bus_load(now)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("TX: 0x%03X - %s", can_id, data.hex())
 
         # In a real implementation, this would send to physical CAN
         # For simulation, we echo back to callbacks
@@ -148,21 +221,21 @@ class CANInterface:
         if len(data) < 8:
             return {}
 
+        soc, soh, voltage, current, temperature, status = _BMS_STATUS_PARSE_STRUCT.unpack_from(data)
         return {
-            "soc": data[0] / 2.0,  # 0-100% in 0.5% steps
-            "soh": data[1],  # 0-100%
-            "voltage": struct.unpack("<H", data[2:4])[0] / 10.0,  # 0-65.535V
-            "current": struct.unpack("<h", data[4:6])[0] / 10.0,  # Signed, +/- 3276.7A
-            "temperature": data[6] - 40,  # -40 to 215 C
-            "status": data[7],  # Status flags
+            "soc": soc / 2.0,  # 0-100% in 0.5% steps
+            "soh": soh,  # 0-100%
+            "voltage": voltage / 10.0,  # 0-65.535V
+            "current": current / 10.0,  # Signed, +/- 3276.7A
+            "temperature": temperature - 40,  # -40 to 215 C
+            "status": status,  # Status flags
         }
 
     def build_bms_status(
         self, soc: float, voltage: float, current: float, temperature: float
     ) -> bytes:
         """Build BMS status message"""
-        return struct.pack(
-            "<BBhhhBB",
+        return _BMS_STATUS_BUILD_STRUCT.pack(
             int(soc * 2),  # SOC
             100,  # SOH
             int(voltage * 10),  # Voltage
@@ -177,41 +250,26 @@ class CANInterface:
         if len(data) < 4:
             return {}
 
-        return {
-            "fl_open": bool(data[0] & 0x01),
-            "fr_open": bool(data[0] & 0x02),
-            "rl_open": bool(data[0] & 0x04),
-            "rr_open": bool(data[0] & 0x08),
-            "fl_locked": bool(data[1] & 0x01),
-            "fr_locked": bool(data[1] & 0x02),
-            "rl_locked": bool(data[1] & 0x04),
-            "rr_locked": bool(data[1] & 0x08),
-        }
+        open_flags = data[0]
+        locked_flags = data[1]
+        status = {key: bool(open_flags & mask) for key, mask in _DOOR_OPEN_BITS}
+        status.update({key: bool(locked_flags & mask) for key, mask in _DOOR_LOCKED_BITS})
+        return status
 
     def build_door_status(self, doors: dict) -> bytes:
         """Build door status message"""
-        byte0 = 0
-        byte1 = 0
-
-        if doors.get("fl_open", False):
-            byte0 |= 0x01
-        if doors.get("fr_open", False):
-            byte0 |= 0x02
-        if doors.get("rl_open", False):
-            byte0 |= 0x04
-        if doors.get("rr_open", False):
-            byte0 |= 0x08
-
-        if doors.get("fl_locked", False):
-            byte1 |= 0x01
-        if doors.get("fr_locked", False):
-            byte1 |= 0x02
-        if doors.get("rl_locked", False):
-            byte1 |= 0x04
-        if doors.get("rr_locked", False):
-            byte1 |= 0x08
-
-        return bytes([byte0, byte1, 0, 0])
+        byte0 = sum(mask for key, mask in _DOOR_OPEN_BITS if doors.get(key, False))
+        byte1 = sum(mask for key, mask in _DOOR_LOCKED_BITS if doors.get(key, False))
+        return self.build_door_status_flags(byte0, byte1)
+
+    def build_door_status_flags(self, open_flags: int, locked_flags: int) -> bytes:
+        """
+        Build door status message from packed flag bytes
+        Args:
+            open_flags: Open bits (0x01=FL, 0x02=FR, 0x04=RL, 0x08=RR)
+            locked_flags: Locked bits, same layout as open_flags
+        """
+        return _DOOR_STATUS_STRUCT.pack(open_flags, locked_flags, 0, 0)
 
     def get_bus_load(self) -> float:
         """Get current bus load percentage"""
@@ -236,12 +294,23 @@ class CANInterface:
             List of CAN messages
         """
         if can_id is None:
-            return self.message_log.copy()
-        return [m for m in self.message_log if m.id == can_id]
+            return list(self.message_log)
+        return list(self._log_by_id.get(can_id, ()))
+
+    def enable_logging(self, enabled: bool = True):
+        """
+        Enable or disable recording of sent messages in the message log
+        Args:
+            enabled: False to stop recording (bus load is still tracked)
+        """
+        self.logging_enabled = enabled
 
     def clear_log(self):
         """Clear message log"""
         self.message_log.clear()
+        self._log_by_id.clear()
+        self._bits_window.clear()
+        self._bits_sum = 0
 
     async def start(self):
         """Start CAN interface"""
@@ -259,13 +328,16 @@ class CANInterface:
             # Simulate periodic messages
             await asyncio.sleep(0.1)
 
-            # Update bus load calculation
-            if self.message_log:
-                recent = [m for m in self.message_log if time.time() - m.timestamp < 1.0]
-                bits = sum(m.dlc * 8 + 47 for m in recent)  # Including overhead
-                self.bus_load = (bits / self.bitrate) * 100
-            else:
-                self.bus_load = 0.0
+            # Update bus load from the rolling one-second window
+            self._update_bus_load(time.monotonic_ns())
+
+    def _update_bus_load(self, now: int):
+        """Drop frames older than one second and recompute bus load"""
+        window = self._bits_window
+        cutoff = now - 1_000_000_000
+        while window and window[0][0] <= cutoff:
+            self._bits_sum -= window.popleft()[1]
+        self.bus_load = (self._bits_sum / self.bitrate) * 100
 
 
 if __name__ == "__main__":
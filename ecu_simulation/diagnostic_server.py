@@ -1,8 +1,10 @@
 """UDS Diagnostic Server Simulation Module"""
 
 import asyncio
+import functools
 import logging
-from dataclasses import dataclass
+import struct
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, Optional, Callable
 
@@ -32,6 +34,16 @@ class SID(Enum):
     RESPONSE_PENDING = 0x7F
 
 
+# Raw SID byte checked on every request to refresh the tester present timer
+_TESTER_PRESENT_SID = SID.TESTER_PRESENT.value
+
+# UDS high-byte encoding of the OBD-II DTC system letter
+_DTC_SYSTEM_BYTES = {"P": 0x02, "B": 0x08, "C": 0x01, "U": 0x00}
+
+# Big-endian 16-bit identifier (DID, routine ID)
+_U16_BE = struct.Struct(">H")
+
+
 class NRC(Enum):
     """Negative Response Codes"""
 
@@ -57,16 +69,18 @@ class SessionType(Enum):
     SAFETY_SYSTEM = 0x04
 
 
-@dataclass
+@dataclass(slots=True)
 class DTCRecord:
     """Diagnostic Trouble Code record"""
 
     code: str  # e.g., "P0171"
     status: int  # Status byte
     snapshot: Optional[dict] = None
+    # UDS encoding of ``code``, filled in on first read
+    encoded: Optional[bytes] = field(default=None, repr=False, compare=False)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DiagnosticResponse:
     """Response from diagnostic server"""
 
@@ -76,6 +90,20 @@ class DiagnosticResponse:
     nrc: Optional[int] = None
 
 
+@functools.lru_cache(maxsize=None)
+def _negative_response(sid: int, nrc: NRC) -> DiagnosticResponse:
+    """Get the shared negative response for a service ID and NRC"""
+    return DiagnosticResponse(0x7F, bytes([sid, nrc.value]), True, nrc.value)
+
+
+# Responses with fixed content, shared between requests
+_EMPTY_REQUEST_RESPONSE = DiagnosticResponse(0x7F, bytes([0x10]), True, 0x10)
+_DTC_AVAILABILITY_RESPONSE = DiagnosticResponse(0x59, bytes([0x0A, 0x00, 0x00, 0xFF]))
+_CLEAR_DTC_RESPONSE = DiagnosticResponse(0x54, bytes([0x00, 0x00]))
+_TESTER_PRESENT_RESPONSE = DiagnosticResponse(0x7E, bytes([0x00]))
+_TESTER_PRESENT_SUPPRESSED = DiagnosticResponse(0x00, bytes())
+
+
 class DiagnosticServer:
     """
     UDS (ISO 14229) Diagnostic Server implementation.
@@ -96,12 +124,27 @@ class DiagnosticServer:
         self.security_level = 0
         self.dtcs: Dict[str, DTCRecord] = {}
         self.data_identifiers: Dict[int, bytes] = {}
+        # DID -> (data, DID bytes + data) response record, checked by data identity
+        self._did_records: Dict[int, tuple[bytes, bytes]] = {}
         self.routines: Dict[int, Callable] = {}
         self.running = False
         self.dtc_setting_enabled = True
         self.tester_present_timeout = 5.0
         self.last_tester_present = 0.0
 
+        # Service dispatch table, keyed by raw SID byte
+        self._handlers: Dict[int, Callable] = {
+            SID.DIAGNOSTIC_SESSION_CONTROL.value: self._handle_session_control,
+            SID.READ_DATA_BY_IDENTIFIER.value: self._handle_read_did,
+            SID.WRITE_DATA_BY_IDENTIFIER.value: self._handle_write_did,
+            SID.READ_DTC.value: self._handle_read_dtc,
+            SID.CLEAR_DTC.value: self._handle_clear_dtc,
+            SID.SECURITY_ACCESS.value: self._handle_security_access,
+            SID.ROUTINE_CONTROL.value: self._handle_routine_control,
+            SID.TESTER_PRESENT.value: self._handle_tester_present,
+            SID.CONTROL_DTC_SETTING.value: self._handle_dtc_setting,
+        }
+
         # Initialize standard DIDs
         self._initialize_standard_dids()
 
@@ -125,120 +168,91 @@ class DiagnosticServer:
             DiagnosticResponse
         """
         if len(request) < 1:
-            return DiagnosticResponse(0x7F, bytes([0x10]), True, 0x10)
+            return _EMPTY_REQUEST_RESPONSE
 
         sid = request[0]
 
         # Reset tester present timer on any valid request
-        if sid != SID.TESTER_PRESENT.value:
+        if sid != _TESTER_PRESENT_SID:
             self.last_tester_present = asyncio.get_event_loop().time()
 
+        handler = self._handlers.get(sid)
+        if handler is None:
+            return _negative_response(sid, NRC.SERVICE_NOT_SUPPORTED)
+
         try:
-            # Dispatch to appropriate handler
-            if sid == SID.DIAGNOSTIC_SESSION_CONTROL.value:
-                return await self._handle_session_control(request)
-            elif sid == SID.READ_DATA_BY_IDENTIFIER.value:
-                return await self._handle_read_did(request)
-            elif sid == SID.WRITE_DATA_BY_IDENTIFIER.value:
-                return await self._handle_write_did(request)
-            elif sid == SID.READ_DTC.value:
-                return await self._handle_read_dtc(request)
-            elif sid == SID.CLEAR_DTC.value:
-                return await self._handle_clear_dtc(request)
-            elif sid == SID.SECURITY_ACCESS.value:
-                return await self._handle_security_access(request)
-            elif sid == SID.ROUTINE_CONTROL.value:
-                return await self._handle_routine_control(request)
-            elif sid == SID.TESTER_PRESENT.value:
-                return await self._handle_tester_present(request)
-            elif sid == SID.CONTROL_DTC_SETTING.value:
-                return await self._handle_dtc_setting(request)
-            else:
-                return DiagnosticResponse(
-                    0x7F,
-                    bytes([sid, NRC.SERVICE_NOT_SUPPORTED.value]),
-                    True,
-                    NRC.SERVICE_NOT_SUPPORTED.value,
-                )
+            return await handler(request)
         except Exception as e:
-            logger.error(f"Error processing request: {e}")
-            return DiagnosticResponse(
-                0x7F, bytes([sid, NRC.GENERAL_REJECT.value]), True, NRC.GENERAL_REJECT.value
-            )
+            logger.error("Error processing request: %s", e)
+            return _negative_response(sid, NRC.GENERAL_REJECT)
 
     async def _handle_session_control(self, request: bytes) -> DiagnosticResponse:
         """Handle diagnostic session control (0x10)"""
         if len(request) < 2:
-            return DiagnosticResponse(
-                0x7F, bytes([0x10, NRC.INVALID_KEY.value]), True, NRC.INVALID_KEY.value
-            )
+            return _negative_response(0x10, NRC.INVALID_KEY)
 
         session_type = request[1]
 
         try:
             new_session = SessionType(session_type)
             self.current_session = new_session
-            logger.info(f"Session changed to {new_session.name}")
+            logger.info("Session changed to %s", new_session.name)
 
             return DiagnosticResponse(
                 0x50,  # Positive response SID
                 bytes([session_type, 0x00, 0x00]),  # Session type + P2 + P2*
             )
         except ValueError:
-            return DiagnosticResponse(
-                0x7F,
-                bytes([0x10, NRC.SUB_FUNCTION_NOT_SUPPORTED.value]),
-                True,
-                NRC.SUB_FUNCTION_NOT_SUPPORTED.value,
-            )
+            return _negative_response(0x10, NRC.SUB_FUNCTION_NOT_SUPPORTED)
 
     async def _handle_read_did(self, request: bytes) -> DiagnosticResponse:
         """Handle read data by identifier (0x22)"""
         if len(request) < 3:
-            return DiagnosticResponse(
-                0x7F, bytes([0x22, NRC.INVALID_KEY.value]), True, NRC.INVALID_KEY.value
-            )
+            return _negative_response(0x22, NRC.INVALID_KEY)
 
-        # Parse DIDs (2 bytes each)
-        dids = []
-        for i in range(1, len(request), 2):
-            if i + 1 < len(request):
-                did = (request[i] << 8) | request[i + 1]
-                dids.append(did)
+        # Parse DIDs (2 bytes each), ignoring a trailing odd byte
+        payload = request[1:]
+        if len(payload) % 2:
+            payload = payload[:-1]
+        dids = [did for (did,) in _U16_BE.iter_unpack(payload)]
 
-        response_data = bytearray()
+        records = []
         for did in dids:
-            if did in self.data_identifiers:
-                data = self.data_identifiers[did]
-                # Add DID and data to response
-                response_data.extend(bytes([did >> 8, did & 0xFF]))
-                response_data.extend(data)
-            else:
+            data = self.data_identifiers.get(did)
+            if data is None:
                 return DiagnosticResponse(0x62, bytes([dids[0] >> 8, dids[0] & 0xFF]), False)
+            # Add DID and data to response
+            records.append(self._did_record(did, data))
 
-        return DiagnosticResponse(0x62, bytes(response_data))
+        if len(records) == 1:
+            return DiagnosticResponse(0x62, records[0])
+        return DiagnosticResponse(0x62, b"".join(records))
+
+    def _did_record(self, did: int, data: bytes) -> bytes:
+        """Get the DID + data response record, rebuilt only when the data changes"""
+        cached = self._did_records.get(did)
+        if cached is None or cached[0] is not data:
+            cached = self._did_records[did] = (data, bytes([did >> 8, did & 0xFF]) + data)
+        return cached[1]
 
     async def _handle_write_did(self, request: bytes) -> DiagnosticResponse:
         """Handle write data by identifier (0x2E)"""
         if len(request) < 3:
-            return DiagnosticResponse(
-                0x7F, bytes([0x2E, NRC.INVALID_KEY.value]), True, NRC.INVALID_KEY.value
-            )
+            return _negative_response(0x2E, NRC.INVALID_KEY)
 
-        did = (request[1] << 8) | request[2]
+        did = _U16_BE.unpack_from(request, 1)[0]
         data = request[3:]
 
         self.data_identifiers[did] = data
-        logger.info(f"Wrote DID 0x{did:04X}: {data.hex()}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Wrote DID 0x%04X: %s", did, data.hex())
 
         return DiagnosticResponse(0x6E, bytes([did >> 8, did & 0xFF]))
 
     async def _handle_read_dtc(self, request: bytes) -> DiagnosticResponse:
         """Handle read DTC (0x19)"""
         if len(request) < 2:
-            return DiagnosticResponse(
-                0x7F, bytes([0x19, NRC.INVALID_KEY.value]), True, NRC.INVALID_KEY.value
-            )
+            return _negative_response(0x19, NRC.INVALID_KEY)
 
         sub_function = request[1]
 
@@ -247,47 +261,34 @@ class DiagnosticServer:
 
             for dtc in self.dtcs.values():
                 # Convert DTC code to bytes
-                code_bytes = self._encode_dtc(dtc.code)
+                code_bytes = dtc.encoded
+                if code_bytes is None:
+                    code_bytes = dtc.encoded = self._encode_dtc(dtc.code)
                 response_data.extend(code_bytes)
                 response_data.append(dtc.status)
 
             return DiagnosticResponse(0x59, bytes(response_data))
 
         elif sub_function == 0x0A:  # Read DTC status availability
-            return DiagnosticResponse(
-                0x59,
-                bytes([0x0A, 0x00, 0x00, 0xFF]),  # All DTCs supported
-            )
+            return _DTC_AVAILABILITY_RESPONSE  # All DTCs supported
 
-        return DiagnosticResponse(
-            0x7F,
-            bytes([0x19, NRC.SUB_FUNCTION_NOT_SUPPORTED.value]),
-            True,
-            NRC.SUB_FUNCTION_NOT_SUPPORTED.value,
-        )
+        return _negative_response(0x19, NRC.SUB_FUNCTION_NOT_SUPPORTED)
 
     async def _handle_clear_dtc(self, request: bytes) -> DiagnosticResponse:
         """Handle clear DTC (0x14)"""
         if not self.dtc_setting_enabled:
-            return DiagnosticResponse(
-                0x7F,
-                bytes([0x14, NRC.CONDITIONS_NOT_CORRECT.value]),
-                True,
-                NRC.CONDITIONS_NOT_CORRECT.value,
-            )
+            return _negative_response(0x14, NRC.CONDITIONS_NOT_CORRECT)
 
         # Clear all DTCs
         self.dtcs.clear()
         logger.info("All DTCs cleared")
 
-        return DiagnosticResponse(0x54, bytes([0x00, 0x00]))
+        return _CLEAR_DTC_RESPONSE
 
     async def _handle_security_access(self, request: bytes) -> DiagnosticResponse:
         """Handle security access (0x27)"""
         if len(request) < 2:
-            return DiagnosticResponse(
-                0x7F, bytes([0x27, NRC.INVALID_KEY.value]), True, NRC.INVALID_KEY.value
-            )
+            return _negative_response(0x27, NRC.INVALID_KEY)
 
         sub_function = request[1]
 
@@ -302,12 +303,10 @@ class DiagnosticServer:
     async def _handle_routine_control(self, request: bytes) -> DiagnosticResponse:
         """Handle routine control (0x31)"""
         if len(request) < 4:
-            return DiagnosticResponse(
-                0x7F, bytes([0x31, NRC.INVALID_KEY.value]), True, NRC.INVALID_KEY.value
-            )
+            return _negative_response(0x31, NRC.INVALID_KEY)
 
         control_type = request[1]
-        routine_id = (request[2] << 8) | request[3]
+        routine_id = _U16_BE.unpack_from(request, 2)[0]
 
         if routine_id in self.routines:
             # Execute registered routine
@@ -317,39 +316,27 @@ class DiagnosticServer:
                     0x71, bytes([control_type, routine_id >> 8, routine_id & 0xFF]) + result
                 )
             except Exception as e:
-                logger.error(f"Routine error: {e}")
-                return DiagnosticResponse(
-                    0x7F,
-                    bytes([0x31, NRC.CONDITIONS_NOT_CORRECT.value]),
-                    True,
-                    NRC.CONDITIONS_NOT_CORRECT.value,
-                )
+                logger.error("Routine error: %s", e)
+                return _negative_response(0x31, NRC.CONDITIONS_NOT_CORRECT)
 
-        return DiagnosticResponse(
-            0x7F,
-            bytes([0x31, NRC.REQUEST_SEQUENCE_ERROR.value]),
-            True,
-            NRC.REQUEST_SEQUENCE_ERROR.value,
-        )
+        return _negative_response(0x31, NRC.REQUEST_SEQUENCE_ERROR)
 
     async def _handle_tester_present(self, request: bytes) -> DiagnosticResponse:
         """Handle tester present (0x3E)"""
         self.last_tester_present = asyncio.get_event_loop().time()
         # Check for sub-function (suppress response)
         if len(request) > 1 and request[1] == 0x80:
-            return DiagnosticResponse(0x00, bytes())  # No response
-        return DiagnosticResponse(0x7E, bytes([0x00]))
+            return _TESTER_PRESENT_SUPPRESSED  # No response
+        return _TESTER_PRESENT_RESPONSE
 
     async def _handle_dtc_setting(self, request: bytes) -> DiagnosticResponse:
         """Handle control DTC setting (0x85)"""
         if len(request) < 2:
-            return DiagnosticResponse(
-                0x7F, bytes([0x85, NRC.INVALID_KEY.value]), True, NRC.INVALID_KEY.value
-            )
+            return _negative_response(0x85, NRC.INVALID_KEY)
 
         setting = request[1]
         self.dtc_setting_enabled = bool(setting)
-        logger.info(f"DTC setting: {'ON' if self.dtc_setting_enabled else 'OFF'}")
+        logger.info("DTC setting: %s", "ON" if self.dtc_setting_enabled else "OFF")
 
         return DiagnosticResponse(0xC5, bytes([setting]))
 
@@ -359,35 +346,19 @@ class DiagnosticServer:
         if len(code) < 5:
             return bytes(3)
 
-        system = code[0]
-        digits = code[1:]
-
-        # Convert to UDS encoding
-        byte0 = 0
-        if system == "P":
-            byte0 = 0x02
-        elif system == "B":
-            byte0 = 0x08
-        elif system == "C":
-            byte0 = 0x01
-        elif system == "U":
-            byte0 = 0x00
-
-        byte1 = int(digits[0], 16) << 4 | int(digits[1], 16)
-        byte2 = int(digits[2], 16) << 4 | int(digits[3], 16)
-
-        return bytes([byte0, byte1, byte2])
+        # Convert to UDS encoding: system letter, then four hex digits
+        return bytes([_DTC_SYSTEM_BYTES.get(code[0], 0)]) + bytes.fromhex(code[1:5])
 
     def store_dtc(self, code: str, status: int = 0x01, snapshot: Optional[dict] = None):
         """Store a DTC"""
         self.dtcs[code] = DTCRecord(code=code, status=status, snapshot=snapshot)
-        logger.warning(f"DTC stored: {code}")
+        logger.warning("DTC stored: %s", code)
 
     def clear_dtc(self, code: str):
         """Clear a specific DTC"""
         if code in self.dtcs:
             del self.dtcs[code]
-            logger.info(f"DTC cleared: {code}")
+            logger.info("DTC cleared: %s", code)
 
     def get_all_dtcs(self) -> list[DTCRecord]:
         """Get all stored DTCs"""
@@ -2,10 +2,14 @@
 
 import asyncio
 import logging
+import math
+import time
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, Optional, Callable
 
+from ._fault_signal import FaultSignal
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,7 +32,7 @@ class LockState(Enum):
     CHILD_LOCKED = "CHILD_LOCKED"
 
 
-@dataclass
+@dataclass(slots=True)
 class DoorState:
     """State of a single door"""
 
@@ -39,6 +43,33 @@ class DoorState:
     pinch_detected: bool = False
 
 
+# Travel per simulated actuator step and the time each step takes,
+# keyed by the DoorState attribute being moved
+_TRAVEL_STEPS = {
+    "open_percentage": (5.0, 0.05),
+    "window_position": (10.0, 0.1),
+}
+
+
+@dataclass(slots=True)
+class _Motion:
+    """An in-flight door or window movement, evaluated lazily"""
+
+    start: float
+    target: float
+    t0: float
+    step: float
+    step_time: float
+    stop: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def position(self, now: float) -> float:
+        """Position at time ``now``: the first step applies immediately"""
+        travel = (int((now - self.t0) / self.step_time) + 1) * self.step
+        if self.target >= self.start:
+            return min(self.target, self.start + travel)
+        return max(self.target, self.start - travel)
+
+
 class DoorECU:
     """
     Simulates a Body Domain Controller (BDC) door ECU.
@@ -63,12 +94,24 @@ class DoorECU:
         self.running = False
         self.position_callbacks: Dict[int, list[Callable]] = {}
         self.fault_state = False
+        # Active movements keyed by (door_id, DoorState attribute)
+        self._motions: Dict[tuple[int, str], _Motion] = {}
+        # Last to_dict() export; reset whenever an exported field changes
+        self._dict_cache: Optional[dict] = None
 
         # Initialize all doors
         for i in range(num_doors):
             self.doors[i] = DoorState()
             self.position_callbacks[i] = []
 
+        # Fault names reported for each door, built once
+        self._fault_names = {i: (f"DOOR_{i}_FAULT", f"DOOR_{i}_BLOCKED") for i in self.doors}
+        # Fault name of every door currently in FAULT or BLOCKED, by door ID
+        self._door_faults: Dict[int, str] = {}
+        # Set (and dropped) on a door's next position change, for wait_for_position
+        self._position_events: Dict[int, asyncio.Event] = {}
+        self._fault_signal = FaultSignal(self.get_faults)
+
     def add_position_callback(self, door_id: int, callback: Callable):
         """Add a callback to be notified of position changes"""
         if door_id in self.position_callbacks:
@@ -76,41 +119,108 @@ class DoorECU:
 
     def _notify_position_change(self, door_id: int):
         """Notify all callbacks of position change"""
-        for callback in self.position_callbacks.get(door_id, []):
+        callbacks = self.position_callbacks.get(door_id)
+        if not callbacks:
+            return
+        door = self.doors[door_id]
+        for callback in callbacks:
             try:
-                callback(door_id, self.doors[door_id])
+                callback(door_id, door)
             except Exception as e:
                 logger.error(f"Callback error: {e}")
 
+    def _get_door(self, door_id: int) -> DoorState:
+        """Get a door's state, raising ValueError for unknown IDs"""
+        door = self.doors.get(door_id)
+        if door is None:
+            raise ValueError(f"Invalid door ID: {door_id}")
+        return door
+
+    def _set_position(self, door_id: int, door: DoorState, position: DoorPosition):
+        """Set a door's position, keeping the fault index and export cache current"""
+        door.position = position
+        if position is DoorPosition.FAULT:
+            self._door_faults[door_id] = self._fault_names[door_id][0]
+        elif position is DoorPosition.BLOCKED:
+            self._door_faults[door_id] = self._fault_names[door_id][1]
+        else:
+            self._door_faults.pop(door_id, None)
+        self._dict_cache = None
+        self._fault_signal.notify()
+
+        event = self._position_events.pop(door_id, None)
+        if event is not None:
+            event.set()
+
+    def _current(self, door_id: int, attr: str) -> float:
+        """Get a door/window position, interpolating any movement in progress"""
+        motion = self._motions.get((door_id, attr))
+        if motion is None:
+            return getattr(self.doors[door_id], attr)
+        return motion.position(time.monotonic())
+
+    def _halt(self, door_id: int, attr: str):
+        """Stop a movement in progress, leaving the door/window where it is"""
+        motion = self._motions.pop((door_id, attr), None)
+        if motion is not None:
+            setattr(self.doors[door_id], attr, motion.position(time.monotonic()))
+            motion.stop.set()
+
+    async def _move(self, door_id: int, attr: str, target: float, steps: int) -> bool:
+        """
+        Move a door/window towards target, waiting on a single timer
+        Returns:
+            True if the movement completed, False if it was halted
+        """
+        key = (door_id, attr)
+        step, step_time = _TRAVEL_STEPS[attr]
+        self._halt(door_id, attr)
+        door = self.doors[door_id]
+        motion = _Motion(getattr(door, attr), target, time.monotonic(), step, step_time)
+        self._motions[key] = motion
+
+        completed = False
+        try:
+            await asyncio.wait_for(motion.stop.wait(), steps * step_time)
+        except asyncio.TimeoutError:
+            completed = True
+        finally:
+            if self._motions.get(key) is motion:
+                del self._motions[key]
+                setattr(door, attr, motion.position(time.monotonic()))
+                self._dict_cache = None
+        return completed
+
     def get_door_position(self, door_id: int) -> DoorPosition:
         """Get current position state of a door"""
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-        return self.doors[door_id].position
+        return self._get_door(door_id).position
+
+    async def wait_for_position(self, door_id: int, position: DoorPosition):
+        """Wait until a door reaches the given position"""
+        door = self._get_door(door_id)
+        while door.position is not position:
+            event = self._position_events.get(door_id)
+            if event is None:
+                event = self._position_events[door_id] = asyncio.Event()
+            await event.wait()
 
     def get_door_open_percentage(self, door_id: int) -> float:
         """Get how open a door is (0-100%)"""
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-        return self.doors[door_id].open_percentage
+        self._get_door(door_id)
+        return self._current(door_id, "open_percentage")
 
     def is_locked(self, door_id: int) -> bool:
         """Check if door is locked"""
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-        return self.doors[door_id].lock_state != LockState.UNLOCKED
+        return self._get_door(door_id).lock_state is not LockState.UNLOCKED
 
     def get_lock_state(self, door_id: int) -> LockState:
         """Get lock state of a door"""
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-        return self.doors[door_id].lock_state
+        return self._get_door(door_id).lock_state
 
     def get_window_position(self, door_id: int) -> float:
         """Get window position (0-100%)"""
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-        return self.doors[door_id].window_position
+        self._get_door(door_id)
+        return self._current(door_id, "window_position")
 
     async def open_door(self, door_id: int, target_percentage: float = 100.0):
         """
@@ -119,119 +229,114 @@ class DoorECU:
             door_id: Door identifier
             target_percentage: How open to make the door (0-100)
         """
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-
-        door = self.doors[door_id]
+        door = self._get_door(door_id)
 
         # Check if locked
-        if door.lock_state == LockState.LOCKED:
+        if door.lock_state is LockState.LOCKED:
             logger.warning(f"Door {door_id} is locked, cannot open")
             return
 
         # Check for fault state
         if self.fault_state:
-            door.position = DoorPosition.FAULT
+            self._set_position(door_id, door, DoorPosition.FAULT)
             return
 
-        door.position = DoorPosition.OPENING
+        self._set_position(door_id, door, DoorPosition.OPENING)
 
         # Simulate door movement
-        steps = int(target_percentage - door.open_percentage)
-        for _ in range(abs(steps)):
-            if door.position != DoorPosition.OPENING:
-                break
-            if steps > 0:
-                door.open_percentage = min(target_percentage, door.open_percentage + 5)
-            else:
-                door.open_percentage = max(target_percentage, door.open_percentage - 5)
+        steps = int(target_percentage - self._current(door_id, "open_percentage"))
+        if steps:
             self._notify_position_change(door_id)
-            await asyncio.sleep(0.05)
+            completed = await self._move(door_id, "open_percentage", target_percentage, abs(steps))
+            if not completed:
+                return  # Superseded by another door command
 
-        door.position = DoorPosition.OPEN if door.open_percentage >= 100 else DoorPosition.CLOSED
+        position = DoorPosition.OPEN if door.open_percentage >= 100 else DoorPosition.CLOSED
+        self._set_position(door_id, door, position)
         self._notify_position_change(door_id)
 
     async def close_door(self, door_id: int):
         """Close a door"""
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-
-        door = self.doors[door_id]
-        door.position = DoorPosition.CLOSING
-
-        # Simulate door movement
-        while door.open_percentage > 0:
-            if door.pinch_detected:
-                door.position = DoorPosition.BLOCKED
-                logger.warning(f"Pinch detected on door {door_id}, stopping")
+        door = self._get_door(door_id)
+        self._halt(door_id, "open_percentage")
+        self._set_position(door_id, door, DoorPosition.CLOSING)
+
+        # Simulate door movement; trigger_pinch halts it
+        if door.open_percentage > 0:
+            completed = False
+            if not door.pinch_detected:
+                self._notify_position_change(door_id)
+                steps = math.ceil(door.open_percentage / _TRAVEL_STEPS["open_percentage"][0])
+                completed = await self._move(door_id, "open_percentage", 0, steps)
+            if not completed:
+                if door.pinch_detected:
+                    self._set_position(door_id, door, DoorPosition.BLOCKED)
+                    logger.warning(f"Pinch detected on door {door_id}, stopping")
                 return
 
-            door.open_percentage = max(0, door.open_percentage - 5)
-            self._notify_position_change(door_id)
-            await asyncio.sleep(0.05)
-
-        door.position = DoorPosition.CLOSED
+        self._set_position(door_id, door, DoorPosition.CLOSED)
         self._notify_position_change(door_id)
 
+    def _set_lock_state(self, door_id: int, lock_state: LockState):
+        """Set the lock state of a door (no suspension point, so not a coroutine)"""
+        self._get_door(door_id).lock_state = lock_state
+        self._dict_cache = None
+
     async def lock_door(self, door_id: int):
         """Lock a specific door"""
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-        self.doors[door_id].lock_state = LockState.LOCKED
+        self._set_lock_state(door_id, LockState.LOCKED)
 
     async def unlock_door(self, door_id: int):
         """Unlock a specific door"""
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-        self.doors[door_id].lock_state = LockState.UNLOCKED
+        self._set_lock_state(door_id, LockState.UNLOCKED)
 
     async def lock_all_doors(self):
         """Lock all doors"""
-        for door_id in self.doors:
-            await self.lock_door(door_id)
+        for door in self.doors.values():
+            door.lock_state = LockState.LOCKED
+        self._dict_cache = None
 
     async def unlock_all_doors(self):
         """Unlock all doors"""
-        for door_id in self.doors:
-            await self.unlock_door(door_id)
+        for door in self.doors.values():
+            door.lock_state = LockState.UNLOCKED
+        self._dict_cache = None
 
     def set_child_lock(self, door_id: int, enabled: bool):
         """Enable or disable child lock on rear doors"""
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-        self.doors[door_id].lock_state = LockState.CHILD_LOCKED if enabled else LockState.LOCKED
+        self._set_lock_state(door_id, LockState.CHILD_LOCKED if enabled else LockState.LOCKED)
 
     async def open_window(self, door_id: int, percentage: float = 100.0):
         """Open window on specified door"""
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-
-        door = self.doors[door_id]
+        door = self._get_door(door_id)
         target = max(0, min(100, percentage))
 
-        while door.window_position < target:
-            door.window_position = min(target, door.window_position + 10)
-            await asyncio.sleep(0.1)
+        self._halt(door_id, "window_position")
+        if door.window_position < target:
+            steps = math.ceil((target - door.window_position) / _TRAVEL_STEPS["window_position"][0])
+            await self._move(door_id, "window_position", target, steps)
 
     async def close_window(self, door_id: int):
         """Close window on specified door"""
-        if door_id not in self.doors:
-            raise ValueError(f"Invalid door ID: {door_id}")
-
-        door = self.doors[door_id]
-        while door.window_position > 0:
-            door.window_position = max(0, door.window_position - 10)
-            await asyncio.sleep(0.1)
+        door = self._get_door(door_id)
+        self._halt(door_id, "window_position")
+        if door.window_position > 0:
+            steps = math.ceil(door.window_position / _TRAVEL_STEPS["window_position"][0])
+            await self._move(door_id, "window_position", 0, steps)
 
     def trigger_pinch(self, door_id: int):
         """Trigger pinch detection (for testing)"""
-        if door_id in self.doors:
-            self.doors[door_id].pinch_detected = True
+        door = self.doors.get(door_id)
+        if door is not None:
+            door.pinch_detected = True
+            if door.position is DoorPosition.CLOSING:
+                self._halt(door_id, "open_percentage")
 
     def clear_pinch(self, door_id: int):
         """Clear pinch detection"""
-        if door_id in self.doors:
-            self.doors[door_id].pinch_detected = False
+        door = self.doors.get(door_id)
+        if door is not None:
+            door.pinch_detected = False
 
     def set_fault_state(self, fault: bool):
         """Set fault state for testing"""
@@ -239,15 +344,16 @@ class DoorECU:
 
     def get_faults(self) -> list:
         """Get list of active faults"""
-        faults = []
-
-        for door_id, door in self.doors.items():
-            if door.position == DoorPosition.FAULT:
-                faults.append(f"DOOR_{door_id}_FAULT")
-            if door.position == DoorPosition.BLOCKED:
-                faults.append(f"DOOR_{door_id}_BLOCKED")
+        # One snapshot: waiters evaluate this off the loop thread while faults change
+        return [name for _, name in sorted(self._door_faults.items())]
 
-        return faults
+    def wait_for_faults(self, predicate: Callable[[list], bool], timeout: float) -> bool:
+        """
+        Block until predicate(get_faults()) is true, for up to timeout seconds
+        Returns:
+            True if the predicate held before the timeout
+        """
+        return self._fault_signal.wait_for(predicate, timeout)
 
     def get_dtc(self) -> Optional[str]:
         """Get Diagnostic Trouble Code"""
@@ -268,12 +374,21 @@ class DoorECU:
 
     def to_dict(self) -> dict:
         """Export current state as dictionary"""
+        # Positions of moving doors depend on the clock, so skip the cache then
+        if self._motions:
+            return self._build_dict()
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return {door_id: dict(state) for door_id, state in self._dict_cache.items()}
+
+    def _build_dict(self) -> dict:
+        """Build the state dictionary exported by to_dict()"""
         return {
             door_id: {
                 "position": door.position.value,
                 "lock_state": door.lock_state.value,
-                "open_percentage": door.open_percentage,
-                "window_position": door.window_position,
+                "open_percentage": self._current(door_id, "open_percentage"),
+                "window_position": self._current(door_id, "window_position"),
             }
             for door_id, door in self.doors.items()
         }
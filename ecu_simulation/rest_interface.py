@@ -2,30 +2,66 @@
 
 import asyncio
 import logging
-from dataclasses import dataclass, asdict
+import re
+import time
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 from datetime import datetime
-import json
+
+import orjson
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
 
 logger = logging.getLogger(__name__)
 
+# Door status is keyed by int door ID; battery values may be NumPy scalars
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Strings bytes.fromhex() accepts: hex digit pairs, optionally separated by ASCII whitespace
+_HEX_DATA_RE = re.compile(r"(?:\s*[0-9a-fA-F]{2})*\s*", re.ASCII)
+
+# Last formatted response timestamp, keyed by wall-clock millisecond
+_timestamp_cache: tuple[int, str] = (0, "")
+
+
+def _utc_timestamp(time_ns: int) -> str:
+    """Format a wall-clock time in ISO format (UTC), at most once per millisecond"""
+    global _timestamp_cache
+    time_ms = time_ns // 1_000_000
+    if time_ms != _timestamp_cache[0]:
+        _timestamp_cache = (time_ms, datetime.utcfromtimestamp(time_ns / 1e9).isoformat())
+    return _timestamp_cache[1]
+
 
-@dataclass
+@dataclass(slots=True)
 class APIResponse:
     """Standard API response wrapper"""
 
     success: bool
     data: Any = None
     error: Optional[str] = None
-    timestamp: str = ""
+    # Creation time, only formatted when the timestamp is actually read
+    created_ns: int = field(default_factory=time.time_ns, repr=False)
 
-    def __post_init__(self):
-        if not self.timestamp:
-            self.timestamp = datetime.utcnow().isoformat()
+    @property
+    def timestamp(self) -> str:
+        """Creation time as a UTC ISO timestamp"""
+        return _utc_timestamp(self.created_ns)
 
     def to_json(self) -> str:
         """Convert to JSON string"""
-        return json.dumps(asdict(self))
+        return orjson.dumps(
+            {
+                "success": self.success,
+                "data": self.data,
+                "error": self.error,
+                "timestamp": self.timestamp,
+            },
+            option=_ORJSON_OPTIONS,
+        ).decode()
 
 
 class RESTInterface:
@@ -57,6 +93,40 @@ class RESTInterface:
         self.running = False
         self.signal_subscribers: Dict[str, list] = {}
 
+        # Command dispatch tables; handlers resolve the ECU attributes at call
+        # time so ECUs attached after construction are still picked up
+        self._door_commands = {
+            "open": lambda door_id, kw: self.door_ecu.open_door(
+                door_id, kw.get("target_percentage", 100.0)
+            ),
+            "close": lambda door_id, _kw: self.door_ecu.close_door(door_id),
+            "lock": lambda door_id, _kw: self.door_ecu.lock_door(door_id),
+            "unlock": lambda door_id, _kw: self.door_ecu.unlock_door(door_id),
+            "open_window": lambda door_id, kw: self.door_ecu.open_window(
+                door_id, kw.get("target_percentage", 100.0)
+            ),
+            "close_window": lambda door_id, _kw: self.door_ecu.close_window(door_id),
+        }
+        self._all_door_commands = {
+            "lock_all": lambda: self.door_ecu.lock_all_doors(),
+            "unlock_all": lambda: self.door_ecu.unlock_all_doors(),
+        }
+        self._battery_faults = {
+            "overvoltage": lambda kw: self.battery_ecu.set_cell_voltage(kw.get("cell_id", 0), 4.3),
+            "undervoltage": lambda kw: self.battery_ecu.set_cell_voltage(kw.get("cell_id", 0), 2.5),
+            "overtemperature": lambda kw: self.battery_ecu.set_cell_temperature(
+                kw.get("cell_id", 0), 70.0
+            ),
+        }
+        self._door_faults = {
+            "block": lambda kw: self.door_ecu.trigger_pinch(kw.get("door_id", 0)),
+            "fault": lambda _kw: self.door_ecu.set_fault_state(True),
+            "clear_fault": lambda _kw: self.door_ecu.set_fault_state(False),
+        }
+        # Success payloads are deterministic per (command, door_id), so they are
+        # built once and shared; callers must treat response data as read-only
+        self._door_acks: Dict[tuple, dict] = {}
+
     async def get_battery_status(self) -> APIResponse:
         """Get battery ECU status"""
         if not self.battery_ecu:
@@ -74,24 +144,25 @@ class RESTInterface:
         Args:
             door_id: Optional door ID, if None returns all doors
         """
-        if not self.door_ecu:
+        door_ecu = self.door_ecu
+        if not door_ecu:
             return APIResponse(False, error="Door ECU not available")
 
         try:
             if door_id is not None:
-                if door_id not in self.door_ecu.doors:
+                door = door_ecu.doors.get(door_id)
+                if door is None:
                     return APIResponse(False, error=f"Invalid door ID: {door_id}")
 
-                door = self.door_ecu.doors[door_id]
                 data = {
                     "door_id": door_id,
                     "position": door.position.value,
                     "lock_state": door.lock_state.value,
-                    "open_percentage": door.open_percentage,
-                    "window_position": door.window_position,
+                    "open_percentage": door_ecu.get_door_open_percentage(door_id),
+                    "window_position": door_ecu.get_window_position(door_id),
                 }
             else:
-                data = self.door_ecu.to_dict()
+                data = door_ecu.to_dict()
 
             return APIResponse(True, data=data)
         except Exception as e:
@@ -105,32 +176,23 @@ class RESTInterface:
             command: Command (open, close, lock, unlock, open_window, close_window)
             **kwargs: Additional parameters (e.g., target_percentage)
         """
-        if not self.door_ecu:
+        door_ecu = self.door_ecu
+        if not door_ecu:
             return APIResponse(False, error="Door ECU not available")
 
         try:
-            if door_id not in self.door_ecu.doors:
+            if door_id not in door_ecu.doors:
                 return APIResponse(False, error=f"Invalid door ID: {door_id}")
 
-            match command:
-                case "open":
-                    target = kwargs.get("target_percentage", 100.0)
-                    await self.door_ecu.open_door(door_id, target)
-                case "close":
-                    await self.door_ecu.close_door(door_id)
-                case "lock":
-                    await self.door_ecu.lock_door(door_id)
-                case "unlock":
-                    await self.door_ecu.unlock_door(door_id)
-                case "open_window":
-                    target = kwargs.get("target_percentage", 100.0)
-                    await self.door_ecu.open_window(door_id, target)
-                case "close_window":
-                    await self.door_ecu.close_window(door_id)
-                case _:
-                    return APIResponse(False, error=f"Unknown command: {command}")
-
-            return APIResponse(True, data={"door_id": door_id, "command": command})
+            handler = self._door_commands.get(command)
+            if handler is None:
+                return APIResponse(False, error=f"Unknown command: {command}")
+            await handler(door_id, kwargs)
+
+            ack = self._door_acks.get((command, door_id))
+            if ack is None:
+                ack = self._door_acks[command, door_id] = {"door_id": door_id, "command": command}
+            return APIResponse(True, data=ack)
 
         except Exception as e:
             return APIResponse(False, error=str(e))
@@ -145,13 +207,10 @@ class RESTInterface:
             return APIResponse(False, error="Door ECU not available")
 
         try:
-            match command:
-                case "lock_all":
-                    await self.door_ecu.lock_all_doors()
-                case "unlock_all":
-                    await self.door_ecu.unlock_all_doors()
-                case _:
-                    return APIResponse(False, error=f"Unknown command: {command}")
+            handler = self._all_door_commands.get(command)
+            if handler is None:
+                return APIResponse(False, error=f"Unknown command: {command}")
+            await handler()
 
             return APIResponse(True, data={"command": command})
 
@@ -168,37 +227,18 @@ class RESTInterface:
         """
         try:
             if ecu == "battery" and self.battery_ecu:
-                match fault_type:
-                    case "overvoltage":
-                        cell_id = kwargs.get("cell_id", 0)
-                        self.battery_ecu.set_cell_voltage(cell_id, 4.3)
-                    case "undervoltage":
-                        cell_id = kwargs.get("cell_id", 0)
-                        self.battery_ecu.set_cell_voltage(cell_id, 2.5)
-                    case "overtemperature":
-                        cell_id = kwargs.get("cell_id", 0)
-                        self.battery_ecu.set_cell_temperature(cell_id, 70.0)
-                    case _:
-                        return APIResponse(False, error=f"Unknown fault type: {fault_type}")
-
-                return APIResponse(True, data={"ecu": ecu, "fault": fault_type})
-
+                handlers = self._battery_faults
             elif ecu == "door" and self.door_ecu:
-                match fault_type:
-                    case "block":
-                        door_id = kwargs.get("door_id", 0)
-                        self.door_ecu.trigger_pinch(door_id)
-                    case "fault":
-                        door_id = kwargs.get("door_id", 0)
-                        self.door_ecu.set_fault_state(True)
-                    case "clear_fault":
-                        self.door_ecu.set_fault_state(False)
-                    case _:
-                        return APIResponse(False, error=f"Unknown fault type: {fault_type}")
-
-                return APIResponse(True, data={"ecu": ecu, "fault": fault_type})
+                handlers = self._door_faults
+            else:
+                return APIResponse(False, error=f"Unknown ECU: {ecu}")
 
-            return APIResponse(False, error=f"Unknown ECU: {ecu}")
+            handler = handlers.get(fault_type)
+            if handler is None:
+                return APIResponse(False, error=f"Unknown fault type: {fault_type}")
+            handler(kwargs)
+
+            return APIResponse(True, data={"ecu": ecu, "fault": fault_type})
 
         except Exception as e:
             return APIResponse(False, error=str(e))
@@ -213,9 +253,10 @@ class RESTInterface:
             if ecu == "battery" and self.battery_ecu:
                 self.battery_ecu.clear_dtc()
             elif ecu == "door" and self.door_ecu:
-                self.door_ecu.set_fault_state(False)
-                for door_id in self.door_ecu.doors:
-                    self.door_ecu.clear_pinch(door_id)
+                door_ecu = self.door_ecu
+                door_ecu.set_fault_state(False)
+                for door_id in door_ecu.doors:
+                    door_ecu.clear_pinch(door_id)
             else:
                 return APIResponse(False, error=f"Unknown ECU: {ecu}")
 
@@ -246,18 +287,18 @@ class RESTInterface:
         if not self.can_interface:
             return APIResponse(False, error="CAN interface not available")
 
+        # Reject malformed input up front rather than unwinding a ValueError
+        if not _HEX_DATA_RE.fullmatch(data):
+            return APIResponse(False, error="Invalid hex data")
+
         try:
-            data_bytes = bytes.fromhex(data)
-            success = await self.can_interface.send(can_id, data_bytes)
+            success = await self.can_interface.send(can_id, bytes.fromhex(data))
 
             if success:
                 return APIResponse(True, data={"can_id": can_id, "data": data})
             else:
                 return APIResponse(False, error="Failed to send message")
 
-        except ValueError:
-            return APIResponse(False, error="Invalid hex data")
-
         except Exception as e:
             return APIResponse(False, error=str(e))
 
@@ -268,17 +309,18 @@ class RESTInterface:
             current: Current in Amps (positive = charging)
             duration: Duration in seconds
         """
-        if not self.battery_ecu:
+        battery_ecu = self.battery_ecu
+        if not battery_ecu:
             return APIResponse(False, error="Battery ECU not available")
 
         try:
-            self.battery_ecu.simulate_charge(current, duration)
+            battery_ecu.simulate_charge(current, duration)
             return APIResponse(
                 True,
                 data={
                     "current": current,
                     "duration": duration,
-                    "new_soc": self.battery_ecu.get_soc(),
+                    "new_soc": battery_ecu.get_soc(),
                 },
             )
 
@@ -293,13 +335,15 @@ class RESTInterface:
         """
         try:
             if ecu == "battery" and self.battery_ecu:
-                dtc = self.battery_ecu.get_dtc()
-                faults = self.battery_ecu.check_faults()
+                battery_ecu = self.battery_ecu
+                dtc = battery_ecu.get_dtc()
+                faults = battery_ecu.check_faults()
                 return APIResponse(True, data={"dtc": dtc, "faults": faults})
 
             elif ecu == "door" and self.door_ecu:
-                dtc = self.door_ecu.get_dtc()
-                faults = self.door_ecu.get_faults()
+                door_ecu = self.door_ecu
+                dtc = door_ecu.get_dtc()
+                faults = door_ecu.get_faults()
                 return APIResponse(True, data={"dtc": dtc, "faults": faults})
 
             return APIResponse(False, error=f"Unknown ECU: {ecu}")
@@ -386,4 +430,6 @@ if __name__ == "__main__":
 
         await rest.stop()
 
-    asyncio.run(main())
+    # Prefer uvloop's event loop where installed, without replacing the global policy
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+        runner.run(main())
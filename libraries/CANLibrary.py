@@ -5,14 +5,57 @@ This library provides keywords for interacting with virtual CAN bus
 in Robot Framework tests.
 """
 
+import asyncio
+import functools
 import logging
-import time
-from typing import Optional, List
+from collections import deque
+from typing import Dict, Optional, List
 from robot.api.deco import keyword, library
 
+try:
+    from ._event_loop import BackgroundEventLoop
+except ImportError:  # Imported as a top-level module via --pythonpath libraries
+    from _event_loop import BackgroundEventLoop
+
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1024)
+def _hex_to_bytes(data: str) -> bytes:
+    """Decode a hex payload string; suites tend to resend the same literals"""
+    return bytes.fromhex(data)
+
+
+# Characters hex payload data consists of, and those a masked pattern may also use
+_HEX_CHARS = frozenset("0123456789ABCDEF")
+_PATTERN_CHARS = _HEX_CHARS | {"X"}
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_data_pattern(expected_data: str) -> Optional[tuple[int, int, int]]:
+    """
+    Compile a hex pattern (X = ignore nibble) into (nibble count, value, mask)
+    integers, or None if it contains characters hex data can never match
+    """
+    expected = expected_data.upper()
+    if not _PATTERN_CHARS.issuperset(expected):
+        return None
+    if not expected:
+        return 0, 0, 0
+    value = int(expected.replace("X", "0"), 16)
+    mask = int("".join("0" if c == "X" else "F" for c in expected), 16)
+    return len(expected), value, mask
+
+
+@functools.lru_cache(maxsize=256)
+def _exact_payload(expected_data: str) -> Optional[bytes]:
+    """Decode an unmasked pattern, or None if no payload's hex string can equal it"""
+    expected = expected_data.upper()
+    if len(expected) % 2 or not _HEX_CHARS.issuperset(expected):
+        return None
+    return bytes.fromhex(expected)
+
+
 @library
 class CANLibrary:
     """
@@ -39,26 +82,41 @@ class CANLibrary:
     def __init__(self):
         """Initialize the CAN Library"""
         self._can_interface = None
-        self._received_messages = []
+        # Received messages, oldest dropped beyond max_buffer
+        self._max_buffer = 10000
+        self._received_messages: deque = deque(maxlen=self._max_buffer)
+        self._overflow_warned = False
+        # Same messages bucketed by CAN ID, for filtered queries
+        self._messages_by_id: Dict[int, deque] = {}
+        # Events for IDs a wait_for_can_message() is blocked on; only touched
+        # from the background loop, where the message callback also runs
+        self._message_events: Dict[int, asyncio.Event] = {}
         self._channel = "virtual0"
+        self._event_loop = BackgroundEventLoop("can-library")
 
     @keyword
-    def start_can_interface(self, channel: str = "virtual0", bitrate: int = 500000):
+    def start_can_interface(
+        self, channel: str = "virtual0", bitrate: int = 500000, max_buffer: int = 10000
+    ):
         """
         Start the CAN interface
 
         Arguments:
             channel: CAN channel name
             bitrate: Bus speed in bps
+            max_buffer: Received messages to keep; older ones are dropped
 
         Example:
             | Start CAN Interface | channel=virtual0 | bitrate=500000 |
+            | Start CAN Interface | max_buffer=100000 |
         """
         from ecu_simulation.can_interface import CANInterface
 
         self._can_interface = CANInterface(channel=channel, bitrate=bitrate)
         self._channel = channel
-        self._received_messages = []
+        self._max_buffer = max_buffer
+        self._reset_received_messages()
+        self._event_loop.start()
 
         # Register wildcard callback to capture all messages
         self._can_interface.add_callback(0xFFFFFFFF, self._message_callback)
@@ -67,7 +125,30 @@ class CANLibrary:
 
     def _message_callback(self, message):
         """Internal callback for received messages"""
-        self._received_messages.append(message)
+        received = self._received_messages
+        if len(received) == received.maxlen:
+            # The oldest message is about to be evicted; drop it from its bucket too
+            if not self._overflow_warned:
+                logger.warning(
+                    f"CAN receive buffer full ({received.maxlen} messages), dropping oldest"
+                )
+                self._overflow_warned = True
+            evicted_id = received[0].id
+            bucket = self._messages_by_id[evicted_id]
+            bucket.popleft()
+            if not bucket:
+                del self._messages_by_id[evicted_id]
+        received.append(message)
+
+        bucket = self._messages_by_id.get(message.id)
+        if bucket is None:
+            bucket = self._messages_by_id[message.id] = deque()
+        bucket.append(message)
+
+        # Wake any wait_for_can_message() blocked on this ID
+        event = self._message_events.pop(message.id, None)
+        if event is not None:
+            event.set()
 
     @keyword
     def stop_can_interface(self):
@@ -76,10 +157,18 @@ class CANLibrary:
         Example:
             | Stop CAN Interface |
         """
+        self._event_loop.stop()
         self._can_interface = None
-        self._received_messages = []
+        self._reset_received_messages()
         logger.info("Stopped CAN interface")
 
+    def _reset_received_messages(self):
+        """Start a new, empty receive buffer"""
+        self._received_messages = deque(maxlen=self._max_buffer)
+        self._messages_by_id = {}
+        self._message_events = {}  # Events are bound to the loop that created them
+        self._overflow_warned = False
+
     @keyword
     def send_can_message(self, can_id: int, data: str, extended: bool = False) -> bool:
         """
@@ -97,21 +186,52 @@ class CANLibrary:
             | Send CAN Message | can_id=0x100 | data=01A20405060708 |
             | Send CAN Message | can_id=256 | data=01A20405060708 | extended=True |
         """
-        import asyncio
-
         if self._can_interface is None:
             raise RuntimeError("CAN interface not started")
 
         # Convert hex string to bytes
-        data_bytes = bytes.fromhex(data)
+        data_bytes = _hex_to_bytes(data)
 
         # Send message
-        loop = asyncio.get_event_loop()
-        success = loop.run_until_complete(self._can_interface.send(can_id, data_bytes, extended))
+        success = self._event_loop.run(self._can_interface.send(can_id, data_bytes, extended))
 
-        logger.info(f"Sent CAN message: ID=0x{can_id:03X}, Data={data}")
+        logger.info("Sent CAN message: ID=0x%03X, Data=%s", can_id, data)
         return success
 
+    @keyword
+    def send_can_messages(self, frames: List[dict]) -> List[bool]:
+        """
+        Send several CAN messages in one round trip to the event loop
+
+        Arguments:
+            frames: List of dicts with can_id, data (hex string) and optional extended
+
+        Returns:
+            List with the send result of each frame, in order
+
+        Example:
+            | ${frame1}= | Create Dictionary | can_id=${0x100} | data=01A2 |
+            | ${frame2}= | Create Dictionary | can_id=${0x200} | data=0F00 |
+            | ${results}= | Send CAN Messages | ${{[$frame1, $frame2]}} |
+        """
+        if self._can_interface is None:
+            raise RuntimeError("CAN interface not started")
+
+        # Decode everything up front so a bad frame fails before any is sent
+        requests = [
+            (frame["can_id"], _hex_to_bytes(frame["data"]), frame.get("extended", False))
+            for frame in frames
+        ]
+        results = self._event_loop.run(self._send_all(requests))
+
+        logger.info("Sent %d CAN messages", len(results))
+        return results
+
+    async def _send_all(self, requests: List[tuple]) -> List[bool]:
+        """Send (can_id, data, extended) requests in order on the background loop"""
+        send = self._can_interface.send
+        return [await send(can_id, data, extended) for can_id, data, extended in requests]
+
     @keyword
     def send_bms_status(
         self, soc: float, voltage: float, current: float, temperature: float
@@ -134,11 +254,8 @@ class CANLibrary:
         if self._can_interface is None:
             raise RuntimeError("CAN interface not started")
 
-        import asyncio
-
         data = self._can_interface.build_bms_status(soc, voltage, current, temperature)
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(self._can_interface.send(self.BMS_STATUS_ID, data))
+        return self._event_loop.run(self._can_interface.send(self.BMS_STATUS_ID, data))
 
     @keyword
     def send_door_status(
@@ -174,21 +291,20 @@ class CANLibrary:
         if self._can_interface is None:
             raise RuntimeError("CAN interface not started")
 
-        import asyncio
-
-        doors = {
-            "fl_open": fl_open,
-            "fr_open": fr_open,
-            "rl_open": rl_open,
-            "rr_open": rr_open,
-            "fl_locked": fl_locked,
-            "fr_locked": fr_locked,
-            "rl_locked": rl_locked,
-            "rr_locked": rr_locked,
-        }
-        data = self._can_interface.build_door_status(doors)
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(self._can_interface.send(self.BDC_STATUS_ID, data))
+        open_flags = (
+            (0x01 if fl_open else 0)
+            | (0x02 if fr_open else 0)
+            | (0x04 if rl_open else 0)
+            | (0x08 if rr_open else 0)
+        )
+        locked_flags = (
+            (0x01 if fl_locked else 0)
+            | (0x02 if fr_locked else 0)
+            | (0x04 if rl_locked else 0)
+            | (0x08 if rr_locked else 0)
+        )
+        data = self._can_interface.build_door_status_flags(open_flags, locked_flags)
+        return self._event_loop.run(self._can_interface.send(self.BDC_STATUS_ID, data))
 
     @keyword
     def wait_for_can_message(self, can_id: int, timeout: float = 5.0) -> bool:
@@ -205,13 +321,26 @@ class CANLibrary:
         Example:
             | ${received}= | Wait For CAN Message | can_id=0x100 | timeout=5 |
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            for msg in self._received_messages:
-                if msg.id == can_id:
-                    return True
-            time.sleep(0.05)
-        return False
+        if can_id in self._messages_by_id:
+            return True
+        if self._can_interface is None:
+            return False  # Nothing can arrive while the interface is stopped
+        return self._event_loop.run(self._wait_for_message(can_id, timeout))
+
+    async def _wait_for_message(self, can_id: int, timeout: float) -> bool:
+        """Wait on the background loop until _message_callback sees can_id"""
+        if can_id in self._messages_by_id:
+            return True
+        event = self._message_events.get(can_id)
+        if event is None:
+            event = self._message_events[can_id] = asyncio.Event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            if self._message_events.get(can_id) is event:
+                del self._message_events[can_id]
+            return False
+        return True
 
     @keyword
     def get_last_can_message(self, can_id: Optional[int] = None) -> dict:
@@ -228,17 +357,10 @@ class CANLibrary:
             | ${msg}= | Get Last CAN Message | can_id=0x100 |
             | Log | Received: ${msg['data']} |
         """
-        if not self._received_messages:
+        msg = self._last_message(can_id)
+        if msg is None:
             return {}
 
-        messages = self._received_messages
-        if can_id is not None:
-            messages = [m for m in messages if m.id == can_id]
-
-        if not messages:
-            return {}
-
-        msg = messages[-1]
         return {
             "id": msg.id,
             "data": msg.data.hex(),
@@ -246,6 +368,14 @@ class CANLibrary:
             "dlc": msg.dlc,
         }
 
+    def _last_message(self, can_id: Optional[int] = None):
+        """Get the last received CANMessage (optionally for one ID), or None"""
+        if can_id is None:
+            messages = self._received_messages
+        else:
+            messages = self._messages_by_id.get(can_id)
+        return messages[-1] if messages else None
+
     @keyword
     def get_can_message_count(self, can_id: Optional[int] = None) -> int:
         """
@@ -262,7 +392,7 @@ class CANLibrary:
         """
         if can_id is None:
             return len(self._received_messages)
-        return len([m for m in self._received_messages if m.id == can_id])
+        return len(self._messages_by_id.get(can_id, ()))
 
     @keyword
     def clear_can_messages(self):
@@ -271,7 +401,7 @@ class CANLibrary:
         Example:
             | Clear CAN Messages |
         """
-        self._received_messages = []
+        self._reset_received_messages()
         logger.info("Cleared CAN message buffer")
 
     @keyword
@@ -306,23 +436,26 @@ class CANLibrary:
         Example:
             | ${result}= | Verify CAN Data | can_id=0x100 | expected_data=01A2XXXX |
         """
-        msg = self.get_last_can_message(can_id)
-        if not msg:
+        msg = self._last_message(can_id)
+        if msg is None:
             return False
 
-        actual = msg["data"].upper()
-        expected = expected_data.upper()
-
+        # Compare against the raw payload; no hex string is built for it
+        data = msg.data
         if mask is None:
-            return actual == expected
-
-        # Apply mask
-        for i in range(len(expected)):
-            if i >= len(actual):
-                return False
-            if expected[i] != "X" and expected[i] != actual[i]:
-                return False
-        return True
+            return data == _exact_payload(expected_data)
+
+        # Compare the leading nibbles in one integer operation (X = ignore)
+        pattern = _compile_data_pattern(expected_data)
+        if pattern is None:
+            return False
+        nibbles, value, nibble_mask = pattern
+        if not nibbles:
+            return True
+        if nibbles > 2 * len(data):
+            return False
+        leading = int.from_bytes(data, "big") >> (4 * (2 * len(data) - nibbles))
+        return leading & nibble_mask == value
 
     @keyword
     def get_can_statistics(self) -> dict:
@@ -6,11 +6,24 @@ in Robot Framework tests.
 """
 
 import logging
-from typing import Optional, List
+import struct
+import time
+from typing import Dict, Optional, List
 from robot.api.deco import keyword, library
 
+try:
+    from ._event_loop import BackgroundEventLoop
+except ImportError:  # Imported as a top-level module via --pythonpath libraries
+    from _event_loop import BackgroundEventLoop
+
 logger = logging.getLogger(__name__)
 
+# Request headers: SID + sub-function, SID + 16-bit DID, and
+# SID + control type + 16-bit routine ID
+_SUBFUNCTION_REQUEST = struct.Struct(">BB")
+_DID_REQUEST = struct.Struct(">BH")
+_ROUTINE_REQUEST = struct.Struct(">BBH")
+
 
 @library
 class DiagnosticLibrary:
@@ -39,6 +52,9 @@ class DiagnosticLibrary:
     SID_TESTER_PRESENT = 0x3E
     SID_DTC_SETTING = 0x85
 
+    # ClearDiagnosticInformation for all DTC groups never changes
+    _CLEAR_ALL_DTCS_REQUEST = bytes([SID_CLEAR_DTC, 0xFF, 0xFF])
+
     # Session types
     SESSION_DEFAULT = 0x01
     SESSION_PROGRAMMING = 0x02
@@ -55,6 +71,10 @@ class DiagnosticLibrary:
         """Initialize the Diagnostic Library"""
         self._diag_server = None
         self._current_session = self.SESSION_DEFAULT
+        self._event_loop = BackgroundEventLoop("diagnostic-library")
+        # Decoded text DIDs: did -> (monotonic expiry, text); disabled while the TTL is 0
+        self._did_cache_ttl = 0.0
+        self._did_text_cache: Dict[int, tuple[float, str]] = {}
 
     @keyword
     def start_diagnostic_session(self, ecu_name: str = "VirtualECU"):
@@ -71,11 +91,10 @@ class DiagnosticLibrary:
 
         self._diag_server = DiagnosticServer(ecu_name=ecu_name)
         self._current_session = self.SESSION_DEFAULT
+        self._did_text_cache.clear()
 
-        import asyncio
-
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(self._diag_server.start())
+        self._event_loop.start()
+        self._event_loop.run(self._diag_server.start())
 
         logger.info(f"Started diagnostic session with {ecu_name}")
 
@@ -87,10 +106,8 @@ class DiagnosticLibrary:
             | Stop Diagnostic Session |
         """
         if self._diag_server:
-            import asyncio
-
-            loop = asyncio.get_event_loop()
-            loop.run_until_complete(self._diag_server.stop())
+            self._event_loop.run(self._diag_server.stop())
+            self._event_loop.stop()
             self._diag_server = None
         logger.info("Stopped diagnostic session")
 
@@ -111,15 +128,13 @@ class DiagnosticLibrary:
         if self._diag_server is None:
             raise RuntimeError("Diagnostic session not started")
 
-        import asyncio
-
         request = bytes([self.SID_SESSION_CONTROL, session_type])
-        loop = asyncio.get_event_loop()
-        response = loop.run_until_complete(self._diag_server.process_request(request))
+        response = self._event_loop.run(self._diag_server.process_request(request))
 
         if not response.is_negative:
             self._current_session = session_type
-            logger.info(f"Changed to session type {session_type}")
+            self._did_text_cache.clear()
+            logger.info("Changed to session type %s", session_type)
             return True
         return False
 
@@ -141,14 +156,11 @@ class DiagnosticLibrary:
         if self._diag_server is None:
             raise RuntimeError("Diagnostic session not started")
 
-        import asyncio
-
-        request = bytes([self.SID_READ_DID, (did >> 8) & 0xFF, did & 0xFF])
-        loop = asyncio.get_event_loop()
-        response = loop.run_until_complete(self._diag_server.process_request(request))
+        request = _DID_REQUEST.pack(self.SID_READ_DID, did & 0xFFFF)
+        response = self._event_loop.run(self._diag_server.process_request(request))
 
         if response.is_negative:
-            logger.error(f"Failed to read DID 0x{did:04X}: NRC=0x{response.nrc:02X}")
+            logger.error("Failed to read DID 0x%04X: NRC=0x%02X", did, response.nrc)
             return None
 
         # Extract data (skip DID in response)
@@ -172,17 +184,16 @@ class DiagnosticLibrary:
         if self._diag_server is None:
             raise RuntimeError("Diagnostic session not started")
 
-        import asyncio
-
-        request = bytes([self.SID_WRITE_DID, (did >> 8) & 0xFF, did & 0xFF]) + data
-        loop = asyncio.get_event_loop()
-        response = loop.run_until_complete(self._diag_server.process_request(request))
+        self._did_text_cache.pop(did, None)
+        request = _DID_REQUEST.pack(self.SID_WRITE_DID, did & 0xFFFF) + data
+        response = self._event_loop.run(self._diag_server.process_request(request))
 
         if response.is_negative:
-            logger.error(f"Failed to write DID 0x{did:04X}: NRC=0x{response.nrc:02X}")
+            logger.error("Failed to write DID 0x%04X: NRC=0x%02X", did, response.nrc)
             return False
 
-        logger.info(f"Wrote DID 0x{did:04X}: {data.hex()}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Wrote DID 0x%04X: %s", did, data.hex())
         return True
 
     @keyword
@@ -196,8 +207,7 @@ class DiagnosticLibrary:
         Example:
             | ${serial}= | Read ECU Serial Number |
         """
-        data = self.read_data_identifier(self.DID_ECU_SERIAL)
-        return data.decode("utf-8", errors="ignore") if data else None
+        return self._read_did_text(self.DID_ECU_SERIAL)
 
     @keyword
     def read_software_version(self) -> Optional[str]:
@@ -210,8 +220,38 @@ class DiagnosticLibrary:
         Example:
             | ${version}= | Read Software Version |
         """
-        data = self.read_data_identifier(self.DID_SOFTWARE_VERSION)
-        return data.decode("utf-8", errors="ignore") if data else None
+        return self._read_did_text(self.DID_SOFTWARE_VERSION)
+
+    @keyword
+    def set_did_cache_ttl(self, ttl: float):
+        """
+        Cache decoded text DIDs (serial number, software version) for a while
+
+        Writing a DID or changing session drops its cached value. A TTL of 0
+        (the default) disables the cache.
+
+        Arguments:
+            ttl: Cache lifetime in seconds
+
+        Example:
+            | Set DID Cache TTL | ttl=5 |
+        """
+        self._did_cache_ttl = max(0.0, float(ttl))
+        self._did_text_cache.clear()
+
+    def _read_did_text(self, did: int) -> Optional[str]:
+        """Read a DID as UTF-8 text, served from the TTL cache when enabled"""
+        if self._did_cache_ttl:
+            cached = self._did_text_cache.get(did)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+
+        data = self.read_data_identifier(did)
+        text = data.decode("utf-8", errors="ignore") if data else None
+
+        if self._did_cache_ttl and text is not None:
+            self._did_text_cache[did] = (time.monotonic() + self._did_cache_ttl, text)
+        return text
 
     @keyword
     def read_dtcs(self) -> List[dict]:
@@ -248,14 +288,11 @@ class DiagnosticLibrary:
         if self._diag_server is None:
             raise RuntimeError("Diagnostic session not started")
 
-        import asyncio
-
-        request = bytes([self.SID_CLEAR_DTC, 0xFF, 0xFF])  # Clear all
-        loop = asyncio.get_event_loop()
-        response = loop.run_until_complete(self._diag_server.process_request(request))
+        request = self._CLEAR_ALL_DTCS_REQUEST
+        response = self._event_loop.run(self._diag_server.process_request(request))
 
         if response.is_negative:
-            logger.error(f"Failed to clear DTCs: NRC=0x{response.nrc:02X}")
+            logger.error("Failed to clear DTCs: NRC=0x%02X", response.nrc)
             return False
 
         logger.info("Cleared all DTCs")
@@ -277,7 +314,7 @@ class DiagnosticLibrary:
             raise RuntimeError("Diagnostic session not started")
 
         self._diag_server.store_dtc(code, status)
-        logger.info(f"Stored DTC: {code}")
+        logger.info("Stored DTC: %s", code)
 
     @keyword
     def verify_dtc_exists(self, code: str) -> bool:
@@ -316,15 +353,12 @@ class DiagnosticLibrary:
         if self._diag_server is None:
             raise RuntimeError("Diagnostic session not started")
 
-        import asyncio
-
         sub_function = level * 2 - 1  # Odd for seed request
         request = bytes([self.SID_SECURITY_ACCESS, sub_function])
-        loop = asyncio.get_event_loop()
-        response = loop.run_until_complete(self._diag_server.process_request(request))
+        response = self._event_loop.run(self._diag_server.process_request(request))
 
         if response.is_negative:
-            logger.error(f"Security access denied: NRC=0x{response.nrc:02X}")
+            logger.error("Security access denied: NRC=0x%02X", response.nrc)
             return None
 
         return response.data[1:] if len(response.data) > 1 else response.data
@@ -347,18 +381,15 @@ class DiagnosticLibrary:
         if self._diag_server is None:
             raise RuntimeError("Diagnostic session not started")
 
-        import asyncio
-
         sub_function = level * 2  # Even for send key
-        request = bytes([self.SID_SECURITY_ACCESS, sub_function]) + key
-        loop = asyncio.get_event_loop()
-        response = loop.run_until_complete(self._diag_server.process_request(request))
+        request = _SUBFUNCTION_REQUEST.pack(self.SID_SECURITY_ACCESS, sub_function) + key
+        response = self._event_loop.run(self._diag_server.process_request(request))
 
         if response.is_negative:
-            logger.error(f"Security access denied: NRC=0x{response.nrc:02X}")
+            logger.error("Security access denied: NRC=0x%02X", response.nrc)
             return False
 
-        logger.info(f"Security access granted for level {level}")
+        logger.info("Security access granted for level %s", level)
         return True
 
     @keyword
@@ -380,21 +411,11 @@ class DiagnosticLibrary:
         if self._diag_server is None:
             raise RuntimeError("Diagnostic session not started")
 
-        import asyncio
-
         request = (
-            bytes(
-                [
-                    self.SID_ROUTINE_CONTROL,
-                    control_type,
-                    (routine_id >> 8) & 0xFF,
-                    routine_id & 0xFF,
-                ]
-            )
+            _ROUTINE_REQUEST.pack(self.SID_ROUTINE_CONTROL, control_type, routine_id & 0xFFFF)
             + data
         )
-        loop = asyncio.get_event_loop()
-        response = loop.run_until_complete(self._diag_server.process_request(request))
+        response = self._event_loop.run(self._diag_server.process_request(request))
 
         return not response.is_negative
 
@@ -415,12 +436,9 @@ class DiagnosticLibrary:
         if self._diag_server is None:
             raise RuntimeError("Diagnostic session not started")
 
-        import asyncio
-
         sub_function = 0x80 if suppress_response else 0x00
         request = bytes([self.SID_TESTER_PRESENT, sub_function])
-        loop = asyncio.get_event_loop()
-        response = loop.run_until_complete(self._diag_server.process_request(request))
+        response = self._event_loop.run(self._diag_server.process_request(request))
 
         return not response.is_negative
 
@@ -441,11 +459,8 @@ class DiagnosticLibrary:
         if self._diag_server is None:
             raise RuntimeError("Diagnostic session not started")
 
-        import asyncio
-
         request = bytes([self.SID_DTC_SETTING, 0x01 if enable else 0x00])
-        loop = asyncio.get_event_loop()
-        response = loop.run_until_complete(self._diag_server.process_request(request))
+        response = self._event_loop.run(self._diag_server.process_request(request))
 
         return not response.is_negative
 
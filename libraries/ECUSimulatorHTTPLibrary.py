@@ -5,14 +5,65 @@ via HTTP REST API, enabling more realistic HIL testing with separate processes.
 """
 
 import logging
-from typing import Any, Optional
+import socket
+import time
+from typing import Any, Dict, List, Optional
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from robot.api.deco import keyword, library
 from robot.libraries.BuiltIn import BuiltIn
+from urllib3.connection import HTTPConnection
 
 logger = logging.getLogger(__name__)
 
+# urllib3 already disables Nagle (TCP_NODELAY); also probe idle pooled
+# connections so a dead server is noticed instead of hanging a keyword
+_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, "TCP_KEEPIDLE"):  # Linux only
+    _SOCKET_OPTIONS += [
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10),
+    ]
+
+
+# Request bodies are serialized with orjson rather than requests' json=
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Battery state values fetched by Get Battery State, as named in /ecu/status
+_BATTERY_STATE_KEYS = ("soc", "soh", "voltage", "current", "temperature")
+
+# /health statuses accepted by Wait For ECU Ready; a stopped ECU can be
+# started later via Start ECU
+_READY_STATES = frozenset(("healthy", "stopped"))
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections use _SOCKET_OPTIONS"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", _SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _DefaultsSession(requests.Session):
+    """Session that applies its timeout and verify settings to every request"""
+
+    def __init__(self, timeout: Optional[float] = None, verify: bool = True):
+        super().__init__()
+        self.timeout = timeout
+        self.verify = verify
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        # Passed explicitly: requests lets REQUESTS_CA_BUNDLE override a
+        # session-level verify=False, but not a per-request one
+        kwargs.setdefault("verify", self.verify)
+        return super().request(method, url, *args, **kwargs)
+
 
 @library
 class ECUSimulatorHTTPLibrary:
@@ -55,8 +106,29 @@ class ECUSimulatorHTTPLibrary:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.verify = verify
-        self.session = requests.Session()
+        self.session = _DefaultsSession(timeout, verify)
+        # Keep enough pooled keep-alive connections that concurrent keywords reuse
+        # them instead of reconnecting. No automatic retries: the ECU server
+        # answers 503 while not initialized, and callers rely on seeing that.
+        adapter = _KeepAliveAdapter(pool_connections=4, pool_maxsize=32, pool_block=False)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Responses are small JSON documents; compressing them only costs CPU
+        self.session.headers.update({"Accept": "application/json", "Accept-Encoding": "identity"})
         self._last_response: Optional[requests.Response] = None
+        # Get Last Response Info result for _last_response, built on first use
+        self._last_info: Optional[dict] = None
+        # Full URLs by path; the set of endpoint paths is small and fixed
+        self._urls: Dict[str, str] = {}
+        # Per-cell URL builders, so cell sweeps neither rebuild nor memoize
+        # one path per cell
+        self._cell_voltage_url = f"{self.base_url}/ecu/cell/{{}}/voltage".format
+        self._cell_temperature_url = f"{self.base_url}/ecu/cell/{{}}/temperature".format
+        # Last Get Battery State result and when it was taken; the individual
+        # state getters reuse it while younger than the TTL (0 = disabled)
+        self._state_snapshot: Optional[dict] = None
+        self._state_snapshot_time = 0.0
+        self._state_snapshot_ttl = 0.0
         logger.info(f"Initialized ECUSimulatorHTTPLibrary with base_url={self.base_url}")
 
     # =============================================================================
@@ -65,7 +137,10 @@ class ECUSimulatorHTTPLibrary:
 
     def _url(self, path: str) -> str:
         """Construct full URL from path"""
-        return f"{self.base_url}{path}"
+        url = self._urls.get(path)
+        if url is None:
+            url = self._urls[path] = f"{self.base_url}{path}"
+        return url
 
     def _handle_response(self, response: requests.Response, error_message: str = "") -> dict:
         """
@@ -82,6 +157,7 @@ class ECUSimulatorHTTPLibrary:
             AssertionError: If response indicates an error
         """
         self._last_response = response
+        self._last_info = None
         try:
             response.raise_for_status()
         except requests.HTTPError as e:
@@ -95,41 +171,51 @@ class ECUSimulatorHTTPLibrary:
                     msg = f"{msg} - Response: {response.text[:200]}"
             raise AssertionError(msg) from e
 
+        # Requests are sent with stream=True, so read the body straight off the
+        # connection instead of through iter_content; this also releases it
+        body = response.raw.read(decode_content=True)
+
         # Return JSON for successful responses
         if response.status_code == 204:  # No Content
             return {}
-        return response.json()
+        return orjson.loads(body)
 
     def _get(self, path: str, error_message: str = "") -> dict:
         """Perform GET request"""
-        url = self._url(path)
+        return self._get_url(self._url(path), error_message)
+
+    def _get_url(self, url: str, error_message: str = "") -> dict:
+        """Perform GET request on a full URL"""
         logger.debug(f"GET {url}")
-        response = self.session.get(url, timeout=self.timeout, verify=self.verify)
+        response = self.session.get(url, stream=True)
         return self._handle_response(response, error_message)
 
     def _post(self, path: str, data: Optional[dict] = None, error_message: str = "") -> dict:
         """Perform POST request"""
         url = self._url(path)
         logger.debug(f"POST {url} data={data}")
+        self._state_snapshot = None
         response = self.session.post(
             url,
-            json=data,
-            headers={"Content-Type": "application/json"},
-            timeout=self.timeout,
-            verify=self.verify,
+            data=None if data is None else orjson.dumps(data),
+            headers=_JSON_HEADERS,
+            stream=True,
         )
         return self._handle_response(response, error_message)
 
     def _put(self, path: str, data: Optional[dict] = None, error_message: str = "") -> dict:
         """Perform PUT request"""
-        url = self._url(path)
+        return self._put_url(self._url(path), data, error_message)
+
+    def _put_url(self, url: str, data: Optional[dict] = None, error_message: str = "") -> dict:
+        """Perform PUT request on a full URL"""
         logger.debug(f"PUT {url} data={data}")
+        self._state_snapshot = None
         response = self.session.put(
             url,
-            json=data,
-            headers={"Content-Type": "application/json"},
-            timeout=self.timeout,
-            verify=self.verify,
+            data=None if data is None else orjson.dumps(data),
+            headers=_JSON_HEADERS,
+            stream=True,
         )
         return self._handle_response(response, error_message)
 
@@ -200,8 +286,7 @@ class ECUSimulatorHTTPLibrary:
             | ${soc}= | Get Battery SOC |
             | Should Be True | ${soc} > 80 |
         """
-        result = self._get("/ecu/state/soc", "Failed to get battery SOC")
-        return float(result["value"])
+        return self._state_value("soc", "Failed to get battery SOC")
 
     @keyword
     def get_battery_voltage(self) -> float:
@@ -215,8 +300,7 @@ class ECUSimulatorHTTPLibrary:
             | ${voltage}= | Get Battery Voltage |
             | Log | Pack voltage: ${voltage}V |
         """
-        result = self._get("/ecu/state/voltage", "Failed to get battery voltage")
-        return float(result["value"])
+        return self._state_value("voltage", "Failed to get battery voltage")
 
     @keyword
     def get_battery_current(self) -> float:
@@ -229,8 +313,7 @@ class ECUSimulatorHTTPLibrary:
         Example:
             | ${current}= | Get Battery Current |
         """
-        result = self._get("/ecu/state/current", "Failed to get battery current")
-        return float(result["value"])
+        return self._state_value("current", "Failed to get battery current")
 
     @keyword
     def get_battery_temperature(self) -> float:
@@ -244,8 +327,7 @@ class ECUSimulatorHTTPLibrary:
             | ${temp}= | Get Battery Temperature |
             | Should Be True | ${temp} < 50 |
         """
-        result = self._get("/ecu/state/temperature", "Failed to get battery temperature")
-        return float(result["value"])
+        return self._state_value("temperature", "Failed to get battery temperature")
 
     @keyword
     def get_battery_soh(self) -> float:
@@ -258,8 +340,56 @@ class ECUSimulatorHTTPLibrary:
         Example:
             | ${soh}= | Get Battery SOH |
         """
-        result = self._get("/ecu/state/soh", "Failed to get battery SOH")
-        return float(result["value"])
+        return self._state_value("soh", "Failed to get battery SOH")
+
+    @keyword
+    def get_battery_state(self) -> dict:
+        """
+        Get SOC, SOH, voltage, current and temperature in one request
+
+        Returns:
+            Dictionary with soc, soh, voltage, current and temperature
+
+        Example:
+            | ${state}= | Get Battery State |
+            | Should Be True | ${state}[soc] > 80 |
+        """
+        status = self._get("/ecu/status", "Failed to get battery state")
+        state = {key: float(status[key]) for key in _BATTERY_STATE_KEYS}
+        self._state_snapshot = state
+        self._state_snapshot_time = time.monotonic()
+        return dict(state)
+
+    @keyword
+    def set_state_snapshot_ttl(self, ttl: float):
+        """
+        Let the battery state getters reuse the last Get Battery State result
+
+        Within the TTL, Get Battery SOC/Voltage/Current/Temperature/SOH return
+        values from the last snapshot instead of making a request. Any command
+        sent to the ECU discards the snapshot. A TTL of 0 (default) disables this.
+
+        Arguments:
+            ttl: Snapshot lifetime in seconds
+
+        Example:
+            | Set State Snapshot TTL | 0.05 |
+            | Get Battery State |
+            | ${soc}= | Get Battery SOC |
+        """
+        self._state_snapshot_ttl = max(0.0, float(ttl))
+
+    def _state_value(self, key: str, error_message: str) -> float:
+        """Get one battery state value, from a fresh snapshot if there is one"""
+        snapshot = self._state_snapshot
+        if (
+            snapshot is not None
+            and time.monotonic() - self._state_snapshot_time < self._state_snapshot_ttl
+        ):
+            return snapshot[key]
+        value = self._get(f"/ecu/state/{key}", error_message)["value"]
+        # orjson already decodes JSON reals to float; only coerce anything else
+        return value if type(value) is float else float(value)
 
     # =============================================================================
     # Cell Management Keywords
@@ -279,8 +409,9 @@ class ECUSimulatorHTTPLibrary:
         Example:
             | ${voltage}= | Get Cell Voltage | cell_id=0 |
         """
-        result = self._get(f"/ecu/cell/{cell_id}/voltage", "Failed to get cell voltage")
-        return float(result["voltage"])
+        result = self._get_url(self._cell_voltage_url(cell_id), "Failed to get cell voltage")
+        voltage = result["voltage"]
+        return voltage if type(voltage) is float else float(voltage)
 
     @keyword
     def set_cell_voltage(self, cell_id: int, voltage: float) -> str:
@@ -297,8 +428,8 @@ class ECUSimulatorHTTPLibrary:
         Example:
             | Set Cell Voltage | cell_id=0 | voltage=5.0 |
         """
-        result = self._put(
-            f"/ecu/cell/{cell_id}/voltage",
+        result = self._put_url(
+            self._cell_voltage_url(cell_id),
             {"voltage": voltage},
             f"Failed to set cell {cell_id} voltage",
         )
@@ -319,8 +450,11 @@ class ECUSimulatorHTTPLibrary:
         Example:
             | ${temp}= | Get Cell Temperature | cell_id=0 |
         """
-        result = self._get(f"/ecu/cell/{cell_id}/temperature", "Failed to get cell temperature")
-        return float(result["temperature"])
+        result = self._get_url(
+            self._cell_temperature_url(cell_id), "Failed to get cell temperature"
+        )
+        temperature = result["temperature"]
+        return temperature if type(temperature) is float else float(temperature)
 
     @keyword
     def set_cell_temperature(self, cell_id: int, temperature: float) -> str:
@@ -337,14 +471,74 @@ class ECUSimulatorHTTPLibrary:
         Example:
             | Set Cell Temperature | cell_id=0 | temperature=80 |
         """
-        result = self._put(
-            f"/ecu/cell/{cell_id}/temperature",
+        result = self._put_url(
+            self._cell_temperature_url(cell_id),
             {"temperature": temperature},
             f"Failed to set cell {cell_id} temperature",
         )
         logger.info(f"Set cell {cell_id} temperature to {temperature}C")
         return result.get("message", f"Cell {cell_id} temperature set")
 
+    @keyword
+    def get_all_cell_voltages(self) -> List[float]:
+        """
+        Get voltages of all battery cells in one request
+
+        Returns:
+            Cell voltages in Volts, indexed by cell ID
+
+        Example:
+            | ${voltages}= | Get All Cell Voltages |
+        """
+        result = self._get("/ecu/cells/voltage", "Failed to get cell voltages")
+        return result["voltages"]
+
+    @keyword
+    def set_cell_voltages(self, voltages: Dict[int, float]) -> str:
+        """
+        Set voltages of several cells in one request (for fault injection)
+
+        Arguments:
+            voltages: New voltage values in Volts, by cell ID
+
+        Returns:
+            Confirmation message
+
+        Example:
+            | &{voltages}= | Create Dictionary | 0=4.1 | 10=3.3 | 50=4.0 |
+            | Set Cell Voltages | ${voltages} |
+        """
+        result = self._put(
+            "/ecu/cells/voltage",
+            {"voltages": {str(cell_id): voltage for cell_id, voltage in voltages.items()}},
+            "Failed to set cell voltages",
+        )
+        logger.info(f"Set {len(voltages)} cell voltages")
+        return result.get("message", f"{len(voltages)} cell voltages set")
+
+    @keyword
+    def set_cell_temperatures(self, temperatures: Dict[int, float]) -> str:
+        """
+        Set temperatures of several cells in one request (for fault injection)
+
+        Arguments:
+            temperatures: New temperature values in Celsius, by cell ID
+
+        Returns:
+            Confirmation message
+
+        Example:
+            | &{temperatures}= | Create Dictionary | 0=80 | 1=75 |
+            | Set Cell Temperatures | ${temperatures} |
+        """
+        result = self._put(
+            "/ecu/cells/temperature",
+            {"temperatures": {str(cell_id): temp for cell_id, temp in temperatures.items()}},
+            "Failed to set cell temperatures",
+        )
+        logger.info(f"Set {len(temperatures)} cell temperatures")
+        return result.get("message", f"{len(temperatures)} cell temperatures set")
+
     # =============================================================================
     # Simulation Control Keywords
     # =============================================================================
@@ -502,26 +696,30 @@ class ECUSimulatorHTTPLibrary:
             | ${ready}= | Wait For ECU Ready | timeout=10 |
             | Should Be True | ${ready} |
         """
-        import time
-
-        end_time = time.time() + timeout
+        deadline = time.monotonic() + timeout
+        # Poll quickly at first so a server that is already up is seen at once,
+        # then back off to the requested interval
+        delay = min(0.05, interval)
 
-        while time.time() < end_time:
+        while True:
             try:
                 result = self._get("/health", "ECU health check failed")
                 status = result.get("status", "unknown")
-                logger.info(f"Health check result: {result}, status={status}")
-                # Accept both 'healthy' and 'stopped' as valid states
-                # The ECU can be started later via Start ECU
-                if status in ("healthy", "stopped"):
-                    logger.info(f"ECU server is ready (status: {status})")
+                # Lazy arguments: the result dict is only formatted if logged
+                logger.info("Health check result: %s, status=%s", result, status)
+                if status in _READY_STATES:
+                    logger.info("ECU server is ready (status: %s)", status)
                     return True
             except Exception as e:
-                logger.debug(f"Health check failed: {e}")
+                logger.debug("Health check failed: %s", e)
 
-            time.sleep(interval)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, interval)
 
-        logger.error(f"ECU not ready after {timeout}s")
+        logger.error("ECU not ready after %ss", timeout)
         return False
 
     @keyword
@@ -539,11 +737,15 @@ class ECUSimulatorHTTPLibrary:
         if self._last_response is None:
             return {}
 
-        return {
-            "status_code": self._last_response.status_code,
-            "url": self._last_response.url,
-            "headers": dict(self._last_response.headers),
-        }
+        info = self._last_info
+        if info is None:
+            info = self._last_info = {
+                "status_code": self._last_response.status_code,
+                "url": self._last_response.url,
+                "headers": dict(self._last_response.headers),
+            }
+        # Copies, so a test editing the result cannot alter later calls
+        return {**info, "headers": dict(info["headers"])}
 
 
 if __name__ == "__main__":
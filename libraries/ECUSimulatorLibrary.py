@@ -5,12 +5,17 @@ This library provides keywords for interacting with virtual ECU simulations
 in Robot Framework tests.
 """
 
+import asyncio
 import logging
-import time
 from typing import Optional, Union
 from robot.api.deco import keyword, library
 from robot.libraries.BuiltIn import BuiltIn
 
+try:
+    from ._event_loop import BackgroundEventLoop
+except ImportError:  # Imported as a top-level module via --pythonpath libraries
+    from _event_loop import BackgroundEventLoop
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +40,7 @@ class ECUSimulatorLibrary:
         self._can_interface = None
         self._diag_server = None
         self._running = False
+        self._event_loop = BackgroundEventLoop("ecu-simulator-library")
 
     @keyword
     def start_battery_simulation(self, num_cells: int = 96) -> str:
@@ -75,6 +81,7 @@ class ECUSimulatorLibrary:
             from ecu_simulation.door_ecu import DoorECU
 
             self._door_ecu = DoorECU(num_doors=num_doors)
+            self._event_loop.start()
             logger.info(f"Started door simulation with {num_doors} doors")
         return "door_ecu"
 
@@ -85,6 +92,7 @@ class ECUSimulatorLibrary:
         Example:
             | Stop All Simulations |
         """
+        self._event_loop.stop()
         self._battery_ecu = None
         self._door_ecu = None
         self._running = False
@@ -216,14 +224,10 @@ class ECUSimulatorLibrary:
         Example:
             | Open Door | door_id=0 | target_percentage=100 |
         """
-        import asyncio
-
         if self._door_ecu is None:
             raise RuntimeError("Door ECU not started")
 
-        # Run async function in event loop
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(self._door_ecu.open_door(door_id, target_percentage))
+        self._event_loop.run(self._door_ecu.open_door(door_id, target_percentage))
         logger.info(f"Opened door {door_id} to {target_percentage}%")
 
     @keyword
@@ -237,13 +241,10 @@ class ECUSimulatorLibrary:
         Example:
             | Close Door | door_id=0 |
         """
-        import asyncio
-
         if self._door_ecu is None:
             raise RuntimeError("Door ECU not started")
 
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(self._door_ecu.close_door(door_id))
+        self._event_loop.run(self._door_ecu.close_door(door_id))
         logger.info(f"Closed door {door_id}")
 
     @keyword
@@ -257,13 +258,10 @@ class ECUSimulatorLibrary:
         Example:
             | Lock Door | door_id=0 |
         """
-        import asyncio
-
         if self._door_ecu is None:
             raise RuntimeError("Door ECU not started")
 
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(self._door_ecu.lock_door(door_id))
+        self._event_loop.run(self._door_ecu.lock_door(door_id))
         logger.info(f"Locked door {door_id}")
 
     @keyword
@@ -277,13 +275,10 @@ class ECUSimulatorLibrary:
         Example:
             | Unlock Door | door_id=0 |
         """
-        import asyncio
-
         if self._door_ecu is None:
             raise RuntimeError("Door ECU not started")
 
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(self._door_ecu.unlock_door(door_id))
+        self._event_loop.run(self._door_ecu.unlock_door(door_id))
         logger.info(f"Unlocked door {door_id}")
 
     @keyword
@@ -323,6 +318,9 @@ class ECUSimulatorLibrary:
             raise RuntimeError("Battery ECU not started")
 
         actual_faults = self._battery_ecu.check_faults()
+        # Expected faults are usually listed in the ECU's own reporting order
+        if actual_faults == expected_faults:
+            return True
         return set(actual_faults) == set(expected_faults)
 
     @keyword
@@ -343,13 +341,25 @@ class ECUSimulatorLibrary:
         Example:
             | ${result}= | Wait For Door Position | door_id=0 | expected_position=OPEN | timeout=5 |
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            position = self.get_door_position(door_id)
-            if position == expected_position:
-                return True
-            time.sleep(0.1)
-        return False
+        from ecu_simulation.door_ecu import DoorPosition
+
+        if self._door_ecu is None:
+            raise RuntimeError("Door ECU not started")
+
+        try:
+            target = DoorPosition(expected_position)
+        except ValueError:
+            return False  # Not a position any door can reach
+
+        return self._event_loop.run(self._wait_for_door_position(door_id, target, timeout))
+
+    async def _wait_for_door_position(self, door_id: int, target, timeout: float) -> bool:
+        """Wait on the background loop for the door ECU to report the target position"""
+        try:
+            await asyncio.wait_for(self._door_ecu.wait_for_position(door_id, target), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
 
 
 if __name__ == "__main__":
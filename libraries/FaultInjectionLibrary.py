@@ -7,11 +7,62 @@ for testing purposes in Robot Framework tests.
 
 import logging
 import time
-from typing import Optional, List
+from typing import Callable, Optional, List
 from robot.api.deco import keyword, library
 
 logger = logging.getLogger(__name__)
 
+# Nominal values Clear Battery Faults restores on every cell
+_NOMINAL_CELL_VOLTAGES = dict.fromkeys(range(96), 3.7)
+_NOMINAL_CELL_TEMPERATURES = dict.fromkeys(range(96), 25.0)
+
+# Discharge (A over 1 s) per SOC percentage point for Inject Low SOC:
+# 96 cells x 3.2 Ah x 3600 s, scaled by 1/100 twice (approximate)
+_LOW_SOC_DISCHARGE_PER_POINT = 96 * 3.2 * 3600 / 10_000
+
+# Cell fault type -> (BatteryECU setter, log message) for the Inject Cell keywords
+_CELL_FAULTS = {
+    "cell_overvoltage": ("set_cell_voltage", "Injected overvoltage on cell %s: %sV"),
+    "cell_undervoltage": ("set_cell_voltage", "Injected undervoltage on cell %s: %sV"),
+    "cell_overtemperature": ("set_cell_temperature", "Injected overtemperature on cell %s: %s°C"),
+    "cell_undertemperature": ("set_cell_temperature", "Injected undertemperature on cell %s: %s°C"),
+}
+
+# Injected fault types each clear keyword removes from the tracked list
+_BATTERY_FAULT_TYPES = frozenset(
+    (
+        "cell_overvoltage",
+        "cell_undervoltage",
+        "cell_overtemperature",
+        "cell_undertemperature",
+        "low_soc",
+    )
+)
+_DOOR_FAULT_TYPES = frozenset(("door_block", "door_ecu_fault"))
+
+
+def _wait_for_faults(
+    ecu, get_faults: Callable[[], list], predicate: Callable[[list], bool], timeout: float
+) -> bool:
+    """
+    Wait until predicate(get_faults()) is true, for up to timeout seconds
+
+    ECUs that expose wait_for_faults() wake the caller as soon as their faults
+    change; anything else is polled every 50 ms.
+    """
+    wait_for_faults = getattr(ecu, "wait_for_faults", None)
+    if wait_for_faults is not None:
+        return wait_for_faults(predicate, timeout)
+
+    deadline = time.monotonic() + timeout
+    while True:
+        if predicate(get_faults()):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(0.05, remaining))
+
 
 @library
 class FaultInjectionLibrary:
@@ -62,6 +113,16 @@ class FaultInjectionLibrary:
         """
         self._door_ecu = door_ecu
 
+    def _inject_cell(self, fault_type: str, cell_id: int, value: float):
+        """Set one cell value through the setter for fault_type and record the fault"""
+        if self._battery_ecu is None:
+            raise RuntimeError("Battery ECU not set")
+
+        setter_name, message = _CELL_FAULTS[fault_type]
+        getattr(self._battery_ecu, setter_name)(cell_id, value)
+        self._injected_faults.append((fault_type, cell_id))
+        logger.warning(message, cell_id, value)
+
     @keyword
     def inject_cell_overvoltage(self, cell_id: int, voltage: float = 4.3):
         """
@@ -74,12 +135,7 @@ class FaultInjectionLibrary:
         Example:
             | Inject Cell Overvoltage | cell_id=0 | voltage=4.3 |
         """
-        if self._battery_ecu is None:
-            raise RuntimeError("Battery ECU not set")
-
-        self._battery_ecu.set_cell_voltage(cell_id, voltage)
-        self._injected_faults.append(("cell_overvoltage", cell_id))
-        logger.warning(f"Injected overvoltage on cell {cell_id}: {voltage}V")
+        self._inject_cell("cell_overvoltage", cell_id, voltage)
 
     @keyword
     def inject_cell_undervoltage(self, cell_id: int, voltage: float = 2.5):
@@ -93,12 +149,7 @@ class FaultInjectionLibrary:
         Example:
             | Inject Cell Undervoltage | cell_id=0 | voltage=2.5 |
         """
-        if self._battery_ecu is None:
-            raise RuntimeError("Battery ECU not set")
-
-        self._battery_ecu.set_cell_voltage(cell_id, voltage)
-        self._injected_faults.append(("cell_undervoltage", cell_id))
-        logger.warning(f"Injected undervoltage on cell {cell_id}: {voltage}V")
+        self._inject_cell("cell_undervoltage", cell_id, voltage)
 
     @keyword
     def inject_cell_overtemperature(self, cell_id: int, temperature: float = 70.0):
@@ -112,12 +163,7 @@ class FaultInjectionLibrary:
         Example:
             | Inject Cell Overtemperature | cell_id=0 | temperature=70 |
         """
-        if self._battery_ecu is None:
-            raise RuntimeError("Battery ECU not set")
-
-        self._battery_ecu.set_cell_temperature(cell_id, temperature)
-        self._injected_faults.append(("cell_overtemperature", cell_id))
-        logger.warning(f"Injected overtemperature on cell {cell_id}: {temperature}°C")
+        self._inject_cell("cell_overtemperature", cell_id, temperature)
 
     @keyword
     def inject_cell_undertemperature(self, cell_id: int, temperature: float = -25.0):
@@ -131,12 +177,7 @@ class FaultInjectionLibrary:
         Example:
             | Inject Cell Undertemperature | cell_id=0 | temperature=-25 |
         """
-        if self._battery_ecu is None:
-            raise RuntimeError("Battery ECU not set")
-
-        self._battery_ecu.set_cell_temperature(cell_id, temperature)
-        self._injected_faults.append(("cell_undertemperature", cell_id))
-        logger.warning(f"Injected undertemperature on cell {cell_id}: {temperature}°C")
+        self._inject_cell("cell_undertemperature", cell_id, temperature)
 
     @keyword
     def inject_low_soc(self, soc: float = 5.0):
@@ -154,11 +195,11 @@ class FaultInjectionLibrary:
 
         # Set SOC by simulating heavy discharge
         original_soc = self._battery_ecu.get_soc()
-        discharge_amount = (original_soc - soc) / 100 * 96 * 3.2 * 3600 / 100  # Approximate
+        discharge_amount = (original_soc - soc) * _LOW_SOC_DISCHARGE_PER_POINT
         self._battery_ecu.simulate_charge(-discharge_amount, 1)
 
         self._injected_faults.append(("low_soc", None))
-        logger.warning(f"Injected low SOC: {soc}%")
+        logger.warning("Injected low SOC: %s%%", soc)
 
     @keyword
     def inject_door_block(self, door_id: int):
@@ -176,7 +217,7 @@ class FaultInjectionLibrary:
 
         self._door_ecu.trigger_pinch(door_id)
         self._injected_faults.append(("door_block", door_id))
-        logger.warning(f"Injected block fault on door {door_id}")
+        logger.warning("Injected block fault on door %s", door_id)
 
     @keyword
     def inject_door_ecu_fault(self, door_id: Optional[int] = None):
@@ -194,7 +235,7 @@ class FaultInjectionLibrary:
 
         self._door_ecu.set_fault_state(True)
         self._injected_faults.append(("door_ecu_fault", door_id))
-        logger.warning(f"Injected ECU fault on door {door_id if door_id is not None else 'all'}")
+        logger.warning("Injected ECU fault on door %s", door_id if door_id is not None else "all")
 
     @keyword
     def inject_can_bus_off(self):
@@ -221,7 +262,7 @@ class FaultInjectionLibrary:
             | Inject CAN Frame Loss | can_id=0x100 | loss_rate=0.5 |
         """
         self._injected_faults.append(("can_frame_loss", (can_id, loss_rate)))
-        logger.warning(f"Injected {loss_rate * 100}% frame loss for CAN ID 0x{can_id:03X}")
+        logger.warning("Injected %s%% frame loss for CAN ID 0x%03X", loss_rate * 100, can_id)
 
     @keyword
     def inject_can_signal_corruption(self, can_id: int, bit_offset: int = 0):
@@ -236,7 +277,7 @@ class FaultInjectionLibrary:
             | Inject CAN Signal Corruption | can_id=0x100 | bit_offset=0 |
         """
         self._injected_faults.append(("can_signal_corruption", (can_id, bit_offset)))
-        logger.warning(f"Injected signal corruption for CAN ID 0x{can_id:03X}")
+        logger.warning("Injected signal corruption for CAN ID 0x%03X", can_id)
 
     @keyword
     def verify_battery_fault_detected(self, fault_name: str, timeout: float = 2.0) -> bool:
@@ -257,15 +298,17 @@ class FaultInjectionLibrary:
         if self._battery_ecu is None:
             raise RuntimeError("Battery ECU not set")
 
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            faults = self._battery_ecu.check_faults()
-            if fault_name in faults:
-                logger.info(f"Fault '{fault_name}' detected")
-                return True
-            time.sleep(0.1)
-
-        logger.error(f"Fault '{fault_name}' not detected within {timeout}s")
+        detected = _wait_for_faults(
+            self._battery_ecu,
+            self._battery_ecu.check_faults,
+            lambda faults: fault_name in faults,
+            timeout,
+        )
+        if detected:
+            logger.info("Fault '%s' detected", fault_name)
+            return True
+
+        logger.error("Fault '%s' not detected within %ss", fault_name, timeout)
         return False
 
     @keyword
@@ -287,15 +330,18 @@ class FaultInjectionLibrary:
         if self._door_ecu is None:
             raise RuntimeError("Door ECU not set")
 
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            faults = self._door_ecu.get_faults()
-            if any(f"DOOR_{door_id}" in fault for fault in faults):
-                logger.info(f"Door {door_id} fault detected")
-                return True
-            time.sleep(0.1)
-
-        logger.error(f"Door {door_id} fault not detected within {timeout}s")
+        door_tag = f"DOOR_{door_id}"
+        detected = _wait_for_faults(
+            self._door_ecu,
+            self._door_ecu.get_faults,
+            lambda faults: any(door_tag in fault for fault in faults),
+            timeout,
+        )
+        if detected:
+            logger.info("Door %s fault detected", door_id)
+            return True
+
+        logger.error("Door %s fault not detected within %ss", door_id, timeout)
         return False
 
     @keyword
@@ -338,25 +384,15 @@ class FaultInjectionLibrary:
         if self._battery_ecu is None:
             raise RuntimeError("Battery ECU not set")
 
-        # Reset cell voltages to nominal
-        for i in range(96):
-            self._battery_ecu.set_cell_voltage(i, 3.7)
-            self._battery_ecu.set_cell_temperature(i, 25.0)
+        # Reset cell voltages to nominal, one bulk update per attribute
+        self._battery_ecu.set_cell_voltages(_NOMINAL_CELL_VOLTAGES)
+        self._battery_ecu.set_cell_temperatures(_NOMINAL_CELL_TEMPERATURES)
 
         self._battery_ecu.clear_dtc()
 
         # Clear tracked faults
         self._injected_faults = [
-            f
-            for f in self._injected_faults
-            if f[0]
-            not in [
-                "cell_overvoltage",
-                "cell_undervoltage",
-                "cell_overtemperature",
-                "cell_undertemperature",
-                "low_soc",
-            ]
+            f for f in self._injected_faults if f[0] not in _BATTERY_FAULT_TYPES
         ]
 
         logger.info("Cleared all battery faults")
@@ -376,9 +412,7 @@ class FaultInjectionLibrary:
             self._door_ecu.clear_pinch(door_id)
 
         # Clear tracked faults
-        self._injected_faults = [
-            f for f in self._injected_faults if f[0] not in ["door_block", "door_ecu_fault"]
-        ]
+        self._injected_faults = [f for f in self._injected_faults if f[0] not in _DOOR_FAULT_TYPES]
 
         logger.info("Cleared all door faults")
 
@@ -0,0 +1,55 @@
+"""Background event loop for the asyncio-backed Robot Framework libraries"""
+
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
+
+class BackgroundEventLoop:
+    """
+    Runs one asyncio event loop in a daemon thread.
+
+    Robot keywords are synchronous, so they submit coroutines to this loop
+    instead of driving a fresh run_until_complete() on every call.
+    """
+
+    def __init__(self, name: str = "robot-asyncio"):
+        self._name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the loop thread (no-op if already running)"""
+        if self._loop is not None:
+            return
+        # Only this loop uses uvloop; the global event loop policy is left alone
+        self._loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name=self._name, daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and wait for its result
+        Args:
+            coro: Coroutine to run
+            timeout: Maximum time to wait in seconds (None = wait forever)
+        """
+        if self._loop is None:
+            coro.close()
+            raise RuntimeError("Event loop not started")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def stop(self):
+        """Stop the loop and join its thread"""
+        loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+        self._loop = self._thread = None
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
@@ -0,0 +1,60 @@
+"""Helpers shared by the log and output.xml scanning scripts"""
+
+import mmap
+import os
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Bytes counted per slice when counting lines in a mapped file
+_LINE_COUNT_CHUNK = 1 << 20
+
+
+@contextmanager
+def map_file(path: Path):
+    """Map a file read-only (mmap rejects empty files, which yield b"")"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            yield content
+
+
+def count_lines(content) -> int:
+    """Count lines like str.splitlines() does for newline-separated text"""
+    size = len(content)
+    lines = sum(
+        content[start : start + _LINE_COUNT_CHUNK].count(b"\n")
+        for start in range(0, size, _LINE_COUNT_CHUNK)
+    )
+    if size and content[size - 1 : size] != b"\n":
+        lines += 1  # Unterminated last line
+    return lines
+
+
+def iter_tests(xml_file: Path) -> Iterator[ET.Element]:
+    """
+    Stream the <test> elements of an output.xml
+
+    Each test is yielded once its end tag is read and cleared afterwards, so
+    memory does not grow with suite size.
+    """
+    for _, elem in ET.iterparse(xml_file, events=("end",)):
+        if elem.tag == "test":
+            yield elem
+            elem.clear()
+
+
+def robot_status(test: ET.Element) -> Optional[ET.Element]:
+    """
+    Return the test's Robot (RF 7+) <status> element, or None for other layouts
+
+    In Robot's own schema the last child of a test is its <status>, carrying
+    status and elapsed seconds as attributes and any failure message as text.
+    """
+    status_elem = test[-1] if len(test) else None
+    if status_elem is not None and status_elem.tag == "status" and "elapsed" in status_elem.attrib:
+        return status_elem
+    return None
@@ -6,15 +6,43 @@ This script analyzes test logs and generates reports.
 """
 
 import argparse
-import json
 import re
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
 
+import orjson
 
-@dataclass
+try:
+    from ._log_files import count_lines, iter_tests, map_file, robot_status
+except ImportError:  # Run directly as a script rather than as scripts.<name>
+    from _log_files import count_lines, iter_tests, map_file, robot_status
+
+# Log files are scanned as memory-mapped bytes, so the patterns are bytes
+# patterns and only the matched text is decoded. The raw bytes keep CRLF line
+# endings (text-mode output on Windows), so patterns must accept "\r\n" too.
+
+# Application log patterns, compiled once. They stay separate scans: a line
+# may match more than one (an [ERROR] inside a traceback counts as both).
+_ERROR_RE = re.compile(rb"\[(?:ERROR|CRITICAL)\].*?(?:\n|$)")
+_WARNING_RE = re.compile(rb"\[WARNING\].*?(?:\n|$)")
+_EXCEPTION_RE = re.compile(rb"Traceback.*?(?=\r?\n\r?\n|\Z)", re.DOTALL)
+
+# Test rows in log.html: status class, then the name in the next <td>
+_HTML_TEST_RE = re.compile(rb'class="test-(pass|fail|skip)".*?<td>(.*?)</td>', re.DOTALL)
+
+
+def _matches(pattern: re.Pattern, content) -> List[str]:
+    """Decoded, stripped text of every match, with CRLF line endings normalised"""
+    return [
+        m.group().decode("utf-8", "replace").replace("\r\n", "\n").strip()
+        for m in pattern.finditer(content)
+    ]
+
+
+@dataclass(slots=True)
 class TestResult:
     """Represents a test result"""
 
@@ -26,7 +54,7 @@ class TestResult:
     suite: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class LogStatistics:
     """Statistics from log analysis"""
 
@@ -63,38 +91,47 @@ class LogAnalyzer:
     def _parse_output_xml(self, xml_file: Path) -> LogStatistics:
         """Parse Robot Framework output.xml"""
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
-
-            stats = LogStatistics()
-
-            for test in root.iter("test"):
-                name = test.get("name", "")
-                status = test.get("status", "UNKNOWN")
-
-                # Get duration
-                elapsed = test.find(".//elapsed")
-                duration = float(elapsed.text) if elapsed is not None else 0.0
-
-                # Get message if failed
-                message_elem = test.find(".//msg[@level='FAIL']")
-                message = message_elem.text if message_elem is not None else ""
-
-                result = TestResult(name=name, status=status, duration=duration, message=message)
-
-                stats.total_tests += 1
-                stats.total_duration += duration
-
-                if status == "PASS":
-                    stats.passed += 1
-                elif status == "FAIL":
-                    stats.failed += 1
-                    stats.failures.append(result)
-                elif status == "SKIP":
-                    stats.skipped += 1
-
+            status_counts = Counter()
+            total_duration = 0.0
+            failures = []
+
+            for test in iter_tests(xml_file):
+                # Robot's <status> element when present, else the generic lookups
+                status_elem = robot_status(test)
+                if status_elem is not None:
+                    status = status_elem.get("status", "UNKNOWN")
+                    duration = float(status_elem.get("elapsed"))
+                else:
+                    status = test.get("status", "UNKNOWN")
+                    elapsed = test.find(".//elapsed")
+                    duration = float(elapsed.text) if elapsed is not None else 0.0
+                status_counts[status] += 1
+                total_duration += duration
+
+                # Only failures are reported individually
+                if status == "FAIL":
+                    if status_elem is not None:
+                        message = status_elem.text or ""
+                    else:
+                        message_elem = test.find(".//msg[@level='FAIL']")
+                        message = message_elem.text if message_elem is not None else ""
+                    failures.append(
+                        TestResult(
+                            name=test.get("name", ""),
+                            status=status,
+                            duration=duration,
+                            message=message,
+                        )
+                    )
+
+            stats = LogStatistics(
+                total_tests=status_counts.total(),
+                passed=status_counts["PASS"],
+                failed=status_counts["FAIL"],
+                skipped=status_counts["SKIP"],
+                total_duration=total_duration,
+                failures=failures,
+            )
             self.stats = stats
             return stats
 
@@ -104,16 +141,16 @@ class LogAnalyzer:
 
     def _parse_log_html(self, log_file: Path) -> LogStatistics:
         """Parse Robot Framework log.html (basic regex parsing)"""
-        content = log_file.read_text()
+        with map_file(log_file) as content:
+            # Extract test results using regex
+            matches = _HTML_TEST_RE.findall(content)
 
         stats = LogStatistics()
 
-        # Extract test results using regex
-        test_pattern = r'class="test-(pass|fail|skip)".*?<td>(.*?)</td>'
-        matches = re.findall(test_pattern, content, re.DOTALL)
-
         for status, name in matches:
-            result = TestResult(name=name.strip(), status=status.upper(), duration=0.0)
+            status = status.decode("ascii")
+            name = name.decode("utf-8", "replace").strip()
+            result = TestResult(name=name, status=status.upper(), duration=0.0)
 
             stats.total_tests += 1
 
@@ -135,29 +172,14 @@ class LogAnalyzer:
         if not log_file.exists():
             return {}
 
-        content = log_file.read_text()
-
-        analysis = {
-            "total_lines": len(content.splitlines()),
-            "errors": [],
-            "warnings": [],
-            "exceptions": [],
-        }
-
-        # Find errors
-        error_pattern = r"\[(?:ERROR|CRITICAL)\].*?(?:\n|$)"
-        for match in re.finditer(error_pattern, content):
-            analysis["errors"].append(match.group().strip())
-
-        # Find warnings
-        warning_pattern = r"\[WARNING\].*?(?:\n|$)"
-        for match in re.finditer(warning_pattern, content):
-            analysis["warnings"].append(match.group().strip())
-
-        # Find exceptions
-        exception_pattern = r"Traceback.*?(?=\n\n|\Z)"
-        for match in re.finditer(exception_pattern, content, re.DOTALL):
-            analysis["exceptions"].append(match.group().strip())
+        with map_file(log_file) as content:
+            analysis = {
+                "total_lines": count_lines(content),
+                # Find errors, warnings and exceptions
+                "errors": _matches(_ERROR_RE, content),
+                "warnings": _matches(_WARNING_RE, content),
+                "exceptions": _matches(_EXCEPTION_RE, content),
+            }
 
         return analysis
 
@@ -182,8 +204,7 @@ class LogAnalyzer:
         }
 
         if output_file.suffix == ".json":
-            with open(output_file, "w") as f:
-                json.dump(report, f, indent=2)
+            output_file.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
         else:
             # Generate markdown report
             self._generate_markdown_report(report, output_file)
@@ -192,24 +213,26 @@ class LogAnalyzer:
 
     def _generate_markdown_report(self, report: Dict, output_file: Path):
         """Generate markdown report"""
+        statistics = report["test_statistics"]
         lines = [
             "# Test Analysis Report",
             f"Generated: {report['generated_at']}",
             "",
             "## Test Statistics",
             "",
-            f"- **Total Tests**: {report['test_statistics']['total_tests']}",
-            f"- **Passed**: {report['test_statistics']['passed']}",
-            f"- **Failed**: {report['test_statistics']['failed']}",
-            f"- **Skipped**: {report['test_statistics']['skipped']}",
-            f"- **Pass Rate**: {report['test_statistics']['pass_rate']:.1%}",
-            f"- **Duration**: {report['test_statistics']['total_duration']:.2f}s",
+            f"- **Total Tests**: {statistics['total_tests']}",
+            f"- **Passed**: {statistics['passed']}",
+            f"- **Failed**: {statistics['failed']}",
+            f"- **Skipped**: {statistics['skipped']}",
+            f"- **Pass Rate**: {statistics['pass_rate']:.1%}",
+            f"- **Duration**: {statistics['total_duration']:.2f}s",
             "",
         ]
 
-        if report["failures"]:
+        failures = report["failures"]
+        if failures:
             lines.extend(["## Failures", ""])
-            for failure in report["failures"]:
+            for failure in failures:
                 lines.extend(
                     [
                         f"### {failure['name']}",
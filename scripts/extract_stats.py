@@ -6,12 +6,36 @@ This script extracts statistics from test results and logs.
 """
 
 import argparse
-import json
 import re
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Any
 
+import orjson
+
+try:
+    from ._log_files import count_lines, iter_tests, map_file, robot_status
+except ImportError:  # Run directly as a script rather than as scripts.<name>
+    from _log_files import count_lines, iter_tests, map_file, robot_status
+
+# Log patterns, compiled once. Logs are scanned as memory-mapped bytes, so
+# these are bytes patterns. They are deliberately not merged into one
+# alternation: each starts with a literal, which lets re skip ahead with a
+# fast substring search, and a mixed-prefix (a|b|c) pattern loses that.
+_ERROR_RE = re.compile(rb"\[ERROR\]")
+_WARNING_RE = re.compile(rb"\[WARNING\]")
+_TRACEBACK_RE = re.compile(rb"Traceback")
+_EXECUTION_TIME_RE = re.compile(rb"executed in ([\d.]+)s")
+_CAN_TX_RE = re.compile(rb"CAN TX:")
+_CAN_RX_RE = re.compile(rb"CAN RX:")
+_BUS_LOAD_RE = re.compile(rb"bus load: ([\d.]+)")
+_CAN_ERROR_RE = re.compile(rb"CAN error")
+
+
+def _shallow_asdict(obj) -> Dict[str, Any]:
+    """asdict() for flat dataclasses, without the recursive deep copy"""
+    return {name: getattr(obj, name) for name in obj.__dataclass_fields__}
+
 
 @dataclass
 class TestStats:
@@ -54,16 +78,20 @@ class StatsExtractor:
     def extract_from_robot_output(self, output_xml: Path) -> Dict[str, Any]:
         """Extract stats from Robot Framework output.xml"""
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(output_xml)
-            root = tree.getroot()
-
             stats = TestStats()
 
-            for test in root.iter("test"):
+            for test in iter_tests(output_xml):
                 stats.total += 1
-                status = test.get("status")
+
+                # Robot's <status> element when present, else the generic lookups
+                status_elem = robot_status(test)
+                if status_elem is not None:
+                    status = status_elem.get("status")
+                    elapsed_text = status_elem.get("elapsed")
+                else:
+                    status = test.get("status")
+                    elapsed = test.find(".//elapsed")
+                    elapsed_text = elapsed.text if elapsed is not None else None
 
                 if status == "PASS":
                     stats.passed += 1
@@ -72,66 +100,67 @@ class StatsExtractor:
                 elif status == "SKIP":
                     stats.skipped += 1
 
-                elapsed = test.find(".//elapsed")
-                if elapsed is not None:
-                    stats.total_duration += float(elapsed.text)
+                if elapsed_text is not None:
+                    stats.total_duration += float(elapsed_text)
 
             if stats.total > 0:
                 stats.pass_rate = (stats.passed / stats.total) * 100
                 stats.avg_duration = stats.total_duration / stats.total
 
-            return asdict(stats)
+            return _shallow_asdict(stats)
 
         except Exception as e:
             return {"error": str(e)}
 
     def extract_from_log_file(self, log_file: Path) -> Dict[str, Any]:
         """Extract metrics from application log file"""
-        content = log_file.read_text()
-
-        metrics = {
-            "total_lines": len(content.splitlines()),
-            "error_count": len(re.findall(r"\[ERROR\]", content)),
-            "warning_count": len(re.findall(r"\[WARNING\]", content)),
-            "exception_count": len(re.findall(r"Traceback", content)),
-        }
-
-        # Extract timing information
-        time_pattern = r"executed in ([\d.]+)s"
-        times = re.findall(time_pattern, content)
-        if times:
-            metrics["avg_execution_time"] = sum(float(t) for t in times) / len(times)
+        with map_file(log_file) as content:
+            metrics = {
+                "total_lines": count_lines(content),
+                "error_count": len(_ERROR_RE.findall(content)),
+                "warning_count": len(_WARNING_RE.findall(content)),
+                "exception_count": len(_TRACEBACK_RE.findall(content)),
+            }
+
+            # Extract timing information, folding matches as they are found
+            total_time = 0.0
+            count = 0
+            for match in _EXECUTION_TIME_RE.finditer(content):
+                total_time += float(match.group(1))
+                count += 1
+        if count:
+            metrics["avg_execution_time"] = total_time / count
 
         return metrics
 
     def extract_can_metrics(self, log_file: Path) -> Dict[str, Any]:
         """Extract CAN bus metrics from log"""
-        content = log_file.read_text()
-
-        metrics = CANMetrics()
-
-        # Count CAN messages
-        metrics.total_messages = len(re.findall(r"CAN (?:TX|RX):", content))
+        with map_file(log_file) as content:
+            metrics = CANMetrics()
 
-        # Count TX vs RX
-        metrics.tx_count = len(re.findall(r"CAN TX:", content))
-        metrics.rx_count = len(re.findall(r"CAN RX:", content))
+            # Count TX vs RX; every CAN message is one or the other
+            metrics.tx_count = len(_CAN_TX_RE.findall(content))
+            metrics.rx_count = len(_CAN_RX_RE.findall(content))
+            metrics.total_messages = metrics.tx_count + metrics.rx_count
 
-        # Find bus load
-        load_pattern = r"bus load: ([\d.]+)"
-        loads = re.findall(load_pattern, content)
-        if loads:
-            metrics.bus_load_percent = float(loads[-1])
+            # Find bus load: only the last reading counts, so search back from the end
+            end = len(content)
+            while (start := content.rfind(b"bus load: ", 0, end)) != -1:
+                match = _BUS_LOAD_RE.match(content, start)
+                if match:
+                    metrics.bus_load_percent = float(match.group(1))
+                    break
+                end = start
 
-        # Count errors
-        metrics.error_count = len(re.findall(r"CAN error", content))
+            # Count errors
+            metrics.error_count = len(_CAN_ERROR_RE.findall(content))
 
-        return asdict(metrics)
+        return _shallow_asdict(metrics)
 
     def generate_comparison(self, baseline_file: Path, current_file: Path) -> Dict[str, Any]:
         """Compare current stats with baseline"""
-        baseline = json.loads(baseline_file.read_text())
-        current = json.loads(current_file.read_text())
+        baseline = orjson.loads(baseline_file.read_bytes())
+        current = orjson.loads(current_file.read_bytes())
 
         comparison = {
             "test_count_delta": current.get("total", 0) - baseline.get("total", 0),
@@ -146,11 +175,11 @@ class StatsExtractor:
         trends = []
 
         for stats_file in sorted(stats_files):
-            stats = json.loads(stats_file.read_text())
+            stats = orjson.loads(stats_file.read_bytes())
             stats["source"] = stats_file.name
             trends.append(stats)
 
-        output_file.write_text(json.dumps(trends, indent=2))
+        output_file.write_bytes(orjson.dumps(trends, option=orjson.OPT_INDENT_2))
         print(f"Exported trends for {len(trends)} data points to {output_file}")
 
 
@@ -194,7 +223,7 @@ def main():
         stats["comparison"] = extractor.generate_comparison(args.compare, args.output)
 
     # Write output
-    args.output.write_text(json.dumps(stats, indent=2))
+    args.output.write_bytes(orjson.dumps(stats, option=orjson.OPT_INDENT_2))
     print(f"Statistics extracted to {args.output}")
 
     # Print summary
@@ -6,16 +6,19 @@ This script generates CAN trace files for testing and simulation.
 """
 
 import argparse
-import json
 import struct
 import sys
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
+import numpy as np
+import orjson
 
-@dataclass
+
+@dataclass(slots=True)
 class CANMessage:
     """Represents a CAN message for tracing"""
 
@@ -28,6 +31,22 @@ class CANMessage:
     comment: str = ""
 
 
+# BMS status payload layout: SOC, SOH, voltage, current, temperature, reserved, status
+_BMS_STATUS_STRUCT = struct.Struct("<BBhhhBB")
+
+
+@lru_cache(maxsize=128)
+def _pack_bms_status(soc: int, voltage: int, current: int, temperature: int) -> bytes:
+    """Pack a BMS status payload from raw (already scaled) signal values"""
+    return _BMS_STATUS_STRUCT.pack(soc, 100, voltage, current, temperature, 0, 0x00)
+
+
+@lru_cache(maxsize=128)
+def _pack_door_status(open_mask: int, lock_mask: int) -> bytes:
+    """Pack a door status payload from the open/locked bit masks"""
+    return bytes([open_mask, lock_mask, 0, 0, 0, 0, 0, 0])
+
+
 class CANTraceGenerator:
     """Generate CAN trace files in various formats"""
 
@@ -56,15 +75,11 @@ class CANTraceGenerator:
         temperature: float = 25.0,
     ) -> CANMessage:
         """Generate a BMS status message"""
-        data = struct.pack(
-            "<BBhhhBB",
+        data = _pack_bms_status(
             int(soc * 2),  # SOC
-            100,  # SOH
             int(voltage * 10),  # Voltage
             int(current * 10),  # Current
             int(temperature + 40),  # Temperature
-            0,  # Reserved
-            0x00,  # Status
         )
 
         return CANMessage(
@@ -110,7 +125,7 @@ class CANTraceGenerator:
         if rr_locked:
             byte1 |= 0x08
 
-        data = bytes([byte0, byte1, 0, 0, 0, 0, 0, 0])
+        data = _pack_door_status(byte0, byte1)
 
         return CANMessage(
             timestamp=self.current_time + 0.1,
@@ -127,27 +142,39 @@ class CANTraceGenerator:
         period = 1.0 / frequency
         end_time = self.current_time + duration
 
-        while self.current_time < end_time:
-            # Add BMS status
-            bms = self.generate_bms_status()
-            self.add_message(bms)
-
-            # Add door status
-            door = self.generate_door_status()
-            self.add_message(door)
-
-            self.current_time += period
+        # Each cycle sends BMS status at +0.1 s and door status at +0.2 s, then
+        # advances by one period. Accumulating the same increments in order
+        # reproduces the float timestamps of stepping through them one by one.
+        max_cycles = max(int(duration / (period + 0.2)), 0) + 2
+        steps = np.concatenate(([self.current_time], np.tile([0.1, 0.1, period], max_cycles)))
+        times = np.add.accumulate(steps)
+        starts = times[0::3]
+        cycles = int(np.searchsorted(starts, end_time, side="left"))
+
+        # The payloads are the same every cycle, so pack them once
+        bms = self.generate_bms_status()
+        door = self.generate_door_status()
+        bms_times = times[1 : 3 * cycles : 3].tolist()
+        door_times = times[2 : 3 * cycles : 3].tolist()
+        bms_fields = (bms.channel, bms.id, bms.dlc, bms.data, bms.direction, bms.comment)
+        door_fields = (door.channel, door.id, door.dlc, door.data, door.direction, door.comment)
+        append = self.messages.append
+        for bms_time, door_time in zip(bms_times, door_times, strict=True):
+            append(CANMessage(bms_time, *bms_fields))
+            append(CANMessage(door_time, *door_fields))
+
+        self.current_time = float(starts[cycles])
 
     def save_csv(self, filename: Path):
         """Save trace as CSV file"""
+        lines = ["timestamp,channel,id,dlc,data,direction,comment\n"]
+        lines.extend(
+            f"{msg.timestamp:.6f},{msg.channel},{msg.id:03X},{msg.dlc},"
+            f"{msg.data.hex().upper()},{msg.direction},{msg.comment}\n"
+            for msg in self.messages
+        )
         with open(filename, "w") as f:
-            f.write("timestamp,channel,id,dlc,data,direction,comment\n")
-            for msg in self.messages:
-                data_hex = msg.data.hex().upper()
-                f.write(
-                    f"{msg.timestamp:.6f},{msg.channel},{msg.id:03X},{msg.dlc},"
-                    f"{data_hex},{msg.direction},{msg.comment}\n"
-                )
+            f.write("".join(lines))
         print(f"Saved CSV trace to {filename}")
 
     def save_json(self, filename: Path):
@@ -170,17 +197,18 @@ class CANTraceGenerator:
             ],
         }
 
-        with open(filename, "w") as f:
-            json.dump(trace_data, f, indent=2)
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(trace_data, option=orjson.OPT_INDENT_2))
         print(f"Saved JSON trace to {filename}")
 
     def save_candump(self, filename: Path):
         """Save trace in candump format"""
+        lines = []
+        for msg in self.messages:
+            data_hex = msg.data.hex(" ").upper()
+            lines.append(f"({msg.timestamp:.6f}) can{msg.channel}  #{msg.id:03X}#{data_hex}\n")
         with open(filename, "w") as f:
-            for msg in self.messages:
-                timestamp_str = f"({msg.timestamp:.6f})"
-                data_hex = " ".join(f"{b:02X}" for b in msg.data)
-                f.write(f"{timestamp_str} can{msg.channel}  #{msg.id:03X}#{data_hex}\n")
+            f.write("".join(lines))
         print(f"Saved candump trace to {filename}")
 
     def save_blf(self, filename: Path):
@@ -12,10 +12,17 @@ import platform
 import signal
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
 from typing import Optional
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Optional: follow_log falls back to polling
+    Observer = None
+
 
 class Colors:
     """ANSI color codes for terminal output (Windows compatible)"""
@@ -67,38 +74,99 @@ class ECUSimulatorManager:
     def _get_log_file(self, name: str) -> Path:
         return self.log_dir / f"{name}.log"
 
+    def _read_pid(self, name: str) -> Optional[int]:
+        """Read a simulator's PID file (None if missing or invalid)"""
+        try:
+            return int(self._get_pid_file(name).read_text().strip())
+        except (ValueError, OSError):
+            return None
+
     def _is_running(self, name: str) -> bool:
         """Check if a process is running"""
-        pid_file = self._get_pid_file(name)
-        if not pid_file.exists():
-            return False
+        pid = self._read_pid(name)
+        return pid is not None and self._pid_alive(pid)
 
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        """Check whether a process with the given PID is still running"""
+        if platform.system() == "Windows":
+            # Windows: query the process directly instead of spawning tasklist
+            import ctypes
+
+            PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+            STILL_ACTIVE = 259
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+            if not handle:
+                return False
+            try:
+                exit_code = ctypes.c_ulong()
+                if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                    return False
+                return exit_code.value == STILL_ACTIVE
+            finally:
+                kernel32.CloseHandle(handle)
+
+        # Unix: reap it first if it is our own exited child (a zombie still
+        # answers kill -0), then use kill -0 to check if process exists
         try:
-            pid = int(pid_file.read_text().strip())
-            if platform.system() == "Windows":
-                # Windows: use tasklist to check if process exists
-                result = subprocess.run(
-                    ["tasklist", "/FI", f"PID eq {pid}", "/NH"],
-                    capture_output=True,
-                    text=True,
-                )
-                # Check if PID is in output (more reliable check)
-                return str(pid) in result.stdout and "Not Found" not in result.stdout
-            else:
-                # Unix: use kill -0 to check if process exists
-                os.kill(pid, 0)
-                return True
-        except (ProcessLookupError, ValueError, OSError):
+            if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                return False
+        except ChildProcessError:
+            pass
+        try:
+            os.kill(pid, 0)
+        except OSError:
             return False
+        return True
 
     def _start_process(
         self, name: str, command: list[str], description: str
     ) -> bool:
         """Start a process in the background"""
-        if self._is_running(name):
-            self._log_warn(f"{description} is already running")
-            return True
+        return self._start_processes([(name, command, description)])
+
+    def _start_processes(self, specs: list[tuple[str, list[str], str]]) -> bool:
+        """Start several (name, command, description) processes together"""
+        success = True
+        started = []
+
+        for name, command, description in specs:
+            if self._is_running(name):
+                self._log_warn(f"{description} is already running")
+                continue
+            process = self._spawn_process(name, command, description)
+            if process is None:
+                success = False
+            else:
+                started.append((name, process, description))
+
+        if started:
+            # Wait longer to allow the processes to fully initialize; all of
+            # them share one grace period instead of waiting in turn
+            self._wait_for_startup([process for _, process, _ in started], 1.5)
 
+        for name, process, description in started:
+            success &= self._verify_process(name, process, description)
+
+        return success
+
+    @staticmethod
+    def _wait_for_startup(processes: list[subprocess.Popen], grace: float):
+        """Wait out the startup grace period, returning early if any process exits"""
+        deadline = time.monotonic() + grace
+        delay = 0.01
+        while all(process.poll() is None for process in processes):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.2)
+
+    def _spawn_process(
+        self, name: str, command: list[str], description: str
+    ) -> Optional[subprocess.Popen]:
+        """Launch a process and record its PID (None if it could not be launched)"""
         self._log_info(f"Starting {description}...")
         self._log_info(f"  Command: {' '.join(command)}")
 
@@ -134,42 +202,43 @@ class ECUSimulatorManager:
             pid_file.write_text(str(process.pid))
             self._log_info(f"{description} started (PID: {process.pid})")
             self._log_info(f"  Log: {log_file}")
+            return process
 
-            # Wait longer to allow the process to fully initialize
-            time.sleep(1.5)
-            if process.poll() is not None:
-                # Process exited immediately
-                self._log_error(f"{description} exited immediately")
-                self._log_error(f"  Check log: {log_file}")
-                # Show last few lines of log
-                try:
-                    with open(log_file, "r") as f:
-                        lines = f.readlines()
-                        if lines:
-                            self._log_error("  Last log lines:")
-                            for line in lines[-5:]:
-                                self._log_error(f"    {line.rstrip()}")
-                except Exception:
-                    pass
-                return False
+        except Exception as e:
+            self._log_error(f"Failed to start {description}: {e}")
+            return None
 
+    def _verify_process(self, name: str, process: subprocess.Popen, description: str) -> bool:
+        """Check that a freshly started process is still alive"""
+        if process.poll() is None:
             return True
 
-        except Exception as e:
-            self._log_error(f"Failed to start {description}: {e}")
-            return False
+        # Process exited immediately
+        log_file = self._get_log_file(name)
+        self._log_error(f"{description} exited immediately")
+        self._log_error(f"  Check log: {log_file}")
+        # Show last few lines of log
+        try:
+            with open(log_file, "r") as f:
+                lines = f.readlines()
+                if lines:
+                    self._log_error("  Last log lines:")
+                    for line in lines[-5:]:
+                        self._log_error(f"    {line.rstrip()}")
+        except Exception:
+            pass
+        return False
 
     def _stop_process(self, name: str, description: str) -> bool:
         """Stop a running process"""
-        if not self._is_running(name):
+        pid = self._read_pid(name)
+        if pid is None or not self._pid_alive(pid):
             self._log_warn(f"{description} is not running")
             return True
 
         pid_file = self._get_pid_file(name)
 
         try:
-            pid = int(pid_file.read_text().strip())
-
             if platform.system() == "Windows":
                 # Windows: use taskkill
                 subprocess.run(
@@ -191,36 +260,30 @@ class ECUSimulatorManager:
 
     def start_battery_ecu(self) -> bool:
         """Start the Battery ECU simulator"""
-        # Use pythonw.exe on Windows for background processes (no console)
-        python_exe = self._get_python_executable()
-        command = [
-            python_exe,
-            "-m",
-            "ecu_simulation.battery_ecu",
-        ]
-        return self._start_process("battery_ecu", command, "Battery ECU")
+        return self._start_process(*self._battery_ecu_spec())
 
     def start_battery_ecu_server(self) -> bool:
         """Start the Battery ECU FastAPI server"""
-        # Use pythonw.exe on Windows for background processes (no console)
-        python_exe = self._get_python_executable()
-        command = [
-            python_exe,
-            "-m",
-            "ecu_simulation.battery_ecu_server",
-        ]
-        return self._start_process("battery_ecu_server", command, "Battery ECU Server")
+        return self._start_process(*self._battery_ecu_server_spec())
 
     def start_door_ecu(self) -> bool:
         """Start the Door ECU simulator"""
+        return self._start_process(*self._door_ecu_spec())
+
+    def _battery_ecu_spec(self) -> tuple[str, list[str], str]:
+        return "battery_ecu", self._module_command("ecu_simulation.battery_ecu"), "Battery ECU"
+
+    def _battery_ecu_server_spec(self) -> tuple[str, list[str], str]:
+        command = self._module_command("ecu_simulation.battery_ecu_server")
+        return "battery_ecu_server", command, "Battery ECU Server"
+
+    def _door_ecu_spec(self) -> tuple[str, list[str], str]:
+        return "door_ecu", self._module_command("ecu_simulation.door_ecu"), "Door ECU"
+
+    def _module_command(self, module: str) -> list[str]:
+        """Command line that runs a Python module as a background process"""
         # Use pythonw.exe on Windows for background processes (no console)
-        python_exe = self._get_python_executable()
-        command = [
-            python_exe,
-            "-m",
-            "ecu_simulation.door_ecu",
-        ]
-        return self._start_process("door_ecu", command, "Door ECU")
+        return [self._get_python_executable(), "-m", module]
 
     def _get_python_executable(self) -> str:
         """Get the appropriate Python executable for background processes"""
@@ -235,14 +298,8 @@ class ECUSimulatorManager:
     def start_all(self, with_server: bool = True) -> bool:
         """Start all ECU simulators"""
         self._log_info("Starting ECU simulators...")
-        success = True
-
-        if with_server:
-            success &= self.start_battery_ecu_server()
-        else:
-            success &= self.start_battery_ecu()
-
-        success &= self.start_door_ecu()
+        battery = self._battery_ecu_server_spec() if with_server else self._battery_ecu_spec()
+        success = self._start_processes([battery, self._door_ecu_spec()])
 
         if success:
             self._log_info(f"{Colors.GREEN}All simulators started{Colors.NC}")
@@ -271,8 +328,16 @@ class ECUSimulatorManager:
 
     def restart_all(self, with_server: bool = True) -> bool:
         """Restart all simulators"""
+        pids = [self._read_pid(sim) for sim in ("battery_ecu_server", "battery_ecu", "door_ecu")]
         self.stop_all()
-        time.sleep(2)
+
+        # Give the stopped processes up to 2 s to exit, but don't wait longer than needed
+        deadline = time.monotonic() + 2
+        while any(pid is not None and self._pid_alive(pid) for pid in pids):
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+
         return self.start_all(with_server=with_server)
 
     def show_status(self):
@@ -288,18 +353,18 @@ class ECUSimulatorManager:
         has_any = False
 
         for sim, name in simulators:
-            pid_file = self._get_pid_file(sim)
-
-            if pid_file.exists():
-                has_any = True
-                pid = pid_file.read_text().strip()
-
-                if self._is_running(sim):
-                    status = f"{Colors.GREEN}[+]{Colors.NC} Running"
-                    print(f"  {status} {name} (PID: {pid})")
-                else:
-                    status = f"{Colors.RED}[-]{Colors.NC} Stopped"
-                    print(f"  {status} {name} (stale PID file)")
+            pid = self._read_pid(sim)
+            # No valid PID: skip missing files, report unreadable ones as stale
+            if pid is None and not self._get_pid_file(sim).exists():
+                continue
+
+            has_any = True
+            if pid is not None and self._pid_alive(pid):
+                status = f"{Colors.GREEN}[+]{Colors.NC} Running"
+                print(f"  {status} {name} (PID: {pid})")
+            else:
+                status = f"{Colors.RED}[-]{Colors.NC} Stopped"
+                print(f"  {status} {name} (stale PID file)")
 
         if not has_any:
             print(f"  {Colors.YELLOW}No simulators configured{Colors.NC}")
@@ -315,19 +380,51 @@ class ECUSimulatorManager:
         self._log_info(f"Following {name} log (Ctrl+C to exit)...")
         print(f"{Colors.BLUE}{'='*60}{Colors.NC}")
 
+        changed = threading.Event()
+        observer = self._watch_file(log_file, changed)
+
         try:
             with open(log_file, "r") as f:
                 # Seek to end
                 f.seek(0, 2)
                 while True:
+                    # Clear before reading: a change that lands after this
+                    # point either shows up in readline() or sets the event
+                    changed.clear()
                     line = f.readline()
                     if line:
                         print(line.rstrip())
+                    elif observer is not None:
+                        # Sleep until the file changes; the timeout keeps Ctrl+C responsive
+                        changed.wait(1.0)
                     else:
                         time.sleep(0.1)
         except KeyboardInterrupt:
             print(f"\n{Colors.BLUE}{'='*60}{Colors.NC}")
             self._log_info("Stopped following log")
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+
+    @staticmethod
+    def _watch_file(path: Path, changed: threading.Event):
+        """Set changed whenever path is modified (None if watchdog is unavailable)"""
+        if Observer is None:
+            return None
+
+        target = os.path.abspath(path)
+
+        class _Handler(FileSystemEventHandler):
+            def on_modified(self, event):
+                if os.fsdecode(event.src_path) == target:
+                    changed.set()
+
+        observer = Observer()
+        observer.schedule(_Handler(), os.path.dirname(target))
+        observer.daemon = True
+        observer.start()
+        return observer
 
 
 def main():